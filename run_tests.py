@@ -6,6 +6,7 @@ This script provides a convenient way to run tests with different configurations
 and generate coverage reports.
 """
 
+import os
 import sys
 import subprocess
 import argparse
@@ -62,6 +63,16 @@ def main():
         action="store_true", 
         help="Skip tests requiring network"
     )
+    parser.add_argument(
+        "--network", 
+        action="store_true", 
+        help="Enable tests that perform real downloads (sets RUN_NETWORK_TESTS=1)"
+    )
+    parser.add_argument(
+        "--parallel", 
+        action="store_true", 
+        help="Run tests in parallel worker processes (requires pytest-xdist)"
+    )
     parser.add_argument(
         "--path", 
         type=str, 
@@ -85,6 +96,10 @@ def main():
             "--cov-report=html:htmlcov"
         ])
     
+    # Add parallel execution; tests from one file share a worker
+    if args.parallel:
+        cmd.extend(["-n", "auto", "--dist", "loadfile"])
+    
     # Add test selection
     if args.unit:
         cmd.extend(["-m", "unit"])
@@ -107,6 +122,10 @@ def main():
     if markers:
         cmd.extend(["-m", " and ".join(markers)])
     
+    # Real-download tests are skipped unless explicitly enabled
+    if args.network:
+        os.environ["RUN_NETWORK_TESTS"] = "1"
+    
     # Run the tests
     success = run_command(cmd, "Test Suite")
     
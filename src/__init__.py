@@ -3,27 +3,43 @@ YouTube Downloader Application
 
 A comprehensive multiuser YouTube downloader with session management,
 progress tracking, and both CLI and API interfaces.
+
+Subpackages are imported lazily (PEP 562) so that running the CLI does not
+pay for importing the FastAPI application.
 """
 
+from importlib import import_module
+from importlib.util import find_spec
+
 __version__ = "1.0.0"
 __author__ = "YouTube Downloader Team"
 __description__ = "Multiuser YouTube Downloader with Session Management"
 
 # Main modules
-from . import common
-from . import yt_audio_dl
+_SUBMODULES = ('common', 'yt_audio_dl', 'api')
 
-# Conditionally import API module to avoid FastAPI dependency in Django
-try:
-    from . import api
+# Only advertise the API module when FastAPI is installed (not in Django)
+if find_spec('fastapi') is not None:
     __all__ = [
         'common',
         'yt_audio_dl', 
         'api'
     ]
-except ImportError:
+else:
     # API module not available (e.g., in Django context)
     __all__ = [
         'common',
         'yt_audio_dl'
     ]
+
+
+def __getattr__(name):
+    """Import subpackages on first access."""
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    return import_module(f".{name}", __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,7 +6,6 @@ including request validation and response serialization.
 """
 
 from typing import Optional, Dict, Any, List
-from datetime import datetime
 from pydantic import BaseModel, HttpUrl, Field
 
 
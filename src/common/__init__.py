@@ -13,7 +13,9 @@ from .logging_config import (
     configure_production_logging,
     log_performance_metric,
     LogPerformance,
-    cleanup_old_logs
+    cleanup_old_logs,
+    start_queue_logging,
+    stop_queue_logging
 )
 from .session_manager import SessionManager, get_session_manager, create_session, get_session
 
@@ -35,6 +37,8 @@ __all__ = [
     'log_performance_metric',
     'LogPerformance',
     'cleanup_old_logs',
+    'start_queue_logging',
+    'stop_queue_logging',
     'SessionManager',
     'get_session_manager',
     'create_session',
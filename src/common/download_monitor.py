@@ -7,19 +7,22 @@ and graceful failure management.
 """
 
 import logging
+import random
 import time
 import socket
+import threading
 import urllib.parse
-from typing import Dict, Any, Optional, Callable, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-import json
-from datetime import datetime
 
 # Initialize logger
 logger = logging.getLogger("download_monitor")
 
+RETRY_MAX_DELAY = 30.0  # Cap in seconds for exponential retry backoff
+
 
 class NetworkStatus(Enum):
     """Network connectivity status."""
@@ -51,6 +54,7 @@ class DownloadMetrics:
     eta_seconds: Optional[float] = None
     progress_percent: Optional[float] = None
     retry_count: int = 0
+    retry_delay_seconds: float = 0.0  # Delay before the next retry
     network_errors: int = 0
     success: bool = False
     
@@ -110,12 +114,17 @@ class DownloadMonitor:
         # Active downloads tracking
         self.active_downloads: Dict[str, DownloadMetrics] = {}
         self.completed_downloads: List[DownloadMetrics] = []
+        self._lock = threading.RLock()  # Guards download tracking for concurrent downloads
         
         # Network status
         self.network_status = NetworkStatus.UNKNOWN
         self.last_network_check = 0.0
         self.network_check_interval = 30.0  # Check every 30 seconds
         
+        # Last connectivity probe, reused while younger than network_check_interval
+        self._last_network_result: Optional[NetworkCheckResult] = None
+        self._last_network_probe = 0.0  # time.monotonic() of the last probe
+        
         # Event callbacks
         self.event_callbacks: List[Callable] = []
         
@@ -141,41 +150,40 @@ class DownloadMonitor:
             except Exception as e:
                 logger.error(f"Error in event callback {callback.__name__}: {e}")
     
-    def check_network_connectivity(self) -> NetworkCheckResult:
+    def check_network_connectivity(self, max_age: Optional[float] = None) -> NetworkCheckResult:
         """
         Check network connectivity and YouTube accessibility.
         
+        A result younger than max_age is returned without probing again, so
+        repeated checks during a batch cost nothing.
+        
+        Args:
+            max_age: Maximum age in seconds of a reusable result
+                (defaults to network_check_interval; 0 always probes)
+            
         Returns:
             NetworkCheckResult with connectivity status
         """
-        logger.debug("Checking network connectivity...")
+        if max_age is None:
+            max_age = self.network_check_interval
         
-        try:
-            # Check DNS resolution
-            socket.gethostbyname('www.youtube.com')
-            dns_resolution = True
-            logger.debug("DNS resolution successful")
-        except socket.gaierror as e:
-            dns_resolution = False
-            logger.warning(f"DNS resolution failed: {e}")
+        cached = self._last_network_result
+        if cached is not None and time.monotonic() - self._last_network_probe < max_age:
+            logger.debug("Using cached network connectivity result")
+            return cached
+        
+        logger.debug("Checking network connectivity...")
         
-        # Check if we can reach YouTube
-        youtube_accessible = False
-        error_message = None
+        # Run the DNS and HTTPS probes concurrently so a check costs the
+        # slower of the two round trips rather than their sum
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dns_future = executor.submit(self._probe_dns)
+            youtube_future = executor.submit(self._probe_youtube)
+            dns_resolution = dns_future.result()
+            youtube_accessible, error_message = youtube_future.result()
         
-        if dns_resolution:
-            try:
-                import urllib.request
-                with urllib.request.urlopen('https://www.youtube.com', timeout=10) as response:
-                    if response.status == 200:
-                        youtube_accessible = True
-                        logger.debug("YouTube is accessible")
-                    else:
-                        error_message = f"HTTP {response.status}"
-            except Exception as e:
-                error_message = str(e)
-                logger.warning(f"YouTube accessibility check failed: {e}")
-        else:
+        if not dns_resolution:
+            youtube_accessible = False
             error_message = "DNS resolution failed"
         
         is_online = dns_resolution and youtube_accessible
@@ -190,12 +198,42 @@ class DownloadMonitor:
         # Update network status
         self.network_status = NetworkStatus.ONLINE if is_online else NetworkStatus.OFFLINE
         self.last_network_check = time.time()
+        self._last_network_result = result
+        self._last_network_probe = time.monotonic()
         
         logger.info(f"Network check result: online={is_online}, "
                    f"dns={dns_resolution}, youtube={youtube_accessible}")
         
         return result
     
+    def _probe_dns(self) -> bool:
+        """Check that www.youtube.com resolves."""
+        try:
+            socket.gethostbyname('www.youtube.com')
+            logger.debug("DNS resolution successful")
+            return True
+        except socket.gaierror as e:
+            logger.warning(f"DNS resolution failed: {e}")
+            return False
+    
+    def _probe_youtube(self) -> Tuple[bool, Optional[str]]:
+        """
+        Check that YouTube answers over HTTPS.
+        
+        Returns:
+            Tuple of (accessible, error message)
+        """
+        try:
+            import urllib.request
+            with urllib.request.urlopen('https://www.youtube.com', timeout=10) as response:
+                if response.status == 200:
+                    logger.debug("YouTube is accessible")
+                    return True, None
+                return False, f"HTTP {response.status}"
+        except Exception as e:
+            logger.warning(f"YouTube accessibility check failed: {e}")
+            return False, str(e)
+    
     def should_check_network(self) -> bool:
         """Check if we should perform a network check."""
         if not self.enable_network_checks:
@@ -230,7 +268,8 @@ class DownloadMonitor:
         
         # Initialize download metrics
         metrics = DownloadMetrics(start_time=time.time())
-        self.active_downloads[download_id] = metrics
+        with self._lock:
+            self.active_downloads[download_id] = metrics
         
         self._emit_event(DownloadEvent.STARTED, {
             'download_id': download_id,
@@ -251,12 +290,13 @@ class DownloadMonitor:
             download_id: Download identifier
             progress_data: Progress information from yt-dlp
         """
-        if download_id not in self.active_downloads:
+        with self._lock:
+            metrics = self.active_downloads.get(download_id)
+        
+        if metrics is None:
             logger.warning(f"Received progress update for unknown download: {download_id}")
             return
         
-        metrics = self.active_downloads[download_id]
-        
         # Update metrics
         metrics.downloaded_bytes = progress_data.get('downloaded_bytes', 0)
         metrics.total_bytes = progress_data.get('total_bytes')
@@ -279,7 +319,8 @@ class DownloadMonitor:
             'eta_seconds': metrics.eta_seconds
         })
         
-        logger.debug(f"Progress update for {download_id}: {metrics.progress_percent:.1f}%")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Progress update for {download_id}: {metrics.progress_percent:.1f}%")
     
     def complete_download(self, download_id: str, success: bool, error_message: Optional[str] = None):
         """
@@ -290,18 +331,19 @@ class DownloadMonitor:
             success: Whether download was successful
             error_message: Error message if failed
         """
-        if download_id not in self.active_downloads:
+        with self._lock:
+            metrics = self.active_downloads.pop(download_id, None)
+            if metrics is not None:
+                metrics.end_time = time.time()
+                metrics.success = success
+                
+                # Move to completed downloads
+                self.completed_downloads.append(metrics)
+        
+        if metrics is None:
             logger.warning(f"Received completion for unknown download: {download_id}")
             return
         
-        metrics = self.active_downloads[download_id]
-        metrics.end_time = time.time()
-        metrics.success = success
-        
-        # Move to completed downloads
-        self.completed_downloads.append(metrics)
-        del self.active_downloads[download_id]
-        
         event_type = DownloadEvent.COMPLETED if success else DownloadEvent.FAILED
         
         self._emit_event(event_type, {
@@ -326,12 +368,13 @@ class DownloadMonitor:
         Returns:
             True if retry should be attempted, False if max retries exceeded
         """
-        if download_id not in self.active_downloads:
-            return False
-        
-        metrics = self.active_downloads[download_id]
-        metrics.network_errors += 1
-        metrics.retry_count += 1
+        with self._lock:
+            metrics = self.active_downloads.get(download_id)
+            if metrics is None:
+                return False
+            
+            metrics.network_errors += 1
+            metrics.retry_count += 1
         
         # Classify the error type for better handling
         error_str = str(error).lower()
@@ -361,16 +404,24 @@ class DownloadMonitor:
         })
         
         if metrics.retry_count < self.retry_attempts:
-            # Adjust retry delay based on error type
+            # Adjust base retry delay based on error type
             delay = self.retry_delay
             if error_type == "dns_resolution":
-                delay = min(self.retry_delay * 2, 30)  # Longer delay for DNS issues
+                delay = self.retry_delay * 2  # Longer delay for DNS issues
             elif error_type == "partial_download" or error_type == "download_interruption":
-                delay = min(self.retry_delay * 0.5, 3)  # Shorter delay for download interruptions
+                delay = self.retry_delay * 0.5  # Shorter delay for download interruptions
             elif error_type == "server_error":
-                delay = min(self.retry_delay * 1.5, 20)  # Moderate delay for server errors
+                delay = self.retry_delay * 1.5  # Moderate delay for server errors
+            
+            # Exponential backoff with jitter so concurrent downloads don't
+            # retry in lockstep during an outage
+            delay = min(RETRY_MAX_DELAY, delay * 2 ** (metrics.retry_count - 1))
+            delay *= random.uniform(0.5, 1.0)
             
-            logger.info(f"Will retry download {download_id} in {delay}s (error type: {error_type})")
+            with self._lock:
+                metrics.retry_delay_seconds = delay
+            
+            logger.info(f"Will retry download {download_id} in {delay:.1f}s (error type: {error_type})")
             self._emit_event(DownloadEvent.RETRY_ATTEMPT, {
                 'download_id': download_id,
                 'retry_count': metrics.retry_count,
@@ -448,6 +499,20 @@ class DownloadMonitor:
         else:
             return f"{base_message}: {original_error}"
     
+    def get_retry_delay(self, download_id: str) -> float:
+        """
+        Get the delay chosen by handle_network_error for the next retry.
+        
+        Args:
+            download_id: Download identifier
+            
+        Returns:
+            Delay in seconds, or 0 if the download is not active
+        """
+        with self._lock:
+            metrics = self.active_downloads.get(download_id)
+            return metrics.retry_delay_seconds if metrics else 0.0
+    
     def get_download_status(self, download_id: str) -> Optional[Dict[str, Any]]:
         """
         Get current status of a download.
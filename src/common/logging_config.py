@@ -1,7 +1,9 @@
 import logging
 import logging.config
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
+from typing import List
 import os
 import time
 from datetime import datetime
@@ -340,6 +342,64 @@ def get_performance_logger() -> logging.Logger:
     return logging.getLogger('performance')
 
 
+def start_queue_logging() -> List[QueueListener]:
+    """
+    Move the configured handlers behind queues so logging calls return at once.
+    
+    Each configured logger (and the root logger) gets a single QueueHandler,
+    and a QueueListener thread feeds its records to the original handlers.
+    Call stop_queue_logging() with the returned listeners to flush them and
+    put the original handlers back.
+    
+    Returns:
+        Started listeners, one per logger that had handlers
+    """
+    listeners = []
+    
+    for log in _configured_loggers():
+        handlers = [h for h in log.handlers if not isinstance(h, QueueHandler)]
+        if not handlers:
+            continue
+        
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            log.removeHandler(handler)
+        log.addHandler(QueueHandler(log_queue))
+        
+        listener.start()
+        listeners.append(listener)
+    
+    return listeners
+
+
+def stop_queue_logging(listeners: List[QueueListener]):
+    """
+    Flush and stop listeners returned by start_queue_logging().
+    
+    Each logger's QueueHandler is replaced by the handlers it was feeding,
+    so later records are written directly again.
+    
+    Args:
+        listeners: Listeners to stop
+    """
+    loggers = _configured_loggers()
+    
+    for listener in listeners:
+        listener.stop()
+        for log in loggers:
+            for handler in list(log.handlers):
+                if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+                    log.removeHandler(handler)
+                    for original in listener.handlers:
+                        log.addHandler(original)
+
+
+def _configured_loggers() -> List[logging.Logger]:
+    """Return the root logger and every logger named in LOGGING_CONFIG."""
+    return [logging.getLogger()] + [logging.getLogger(name) for name in LOGGING_CONFIG['loggers']]
+
+
 def cleanup_old_logs(days_to_keep: int = 30):
     """
     Clean up old log files beyond the rotation limit.
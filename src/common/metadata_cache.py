@@ -0,0 +1,188 @@
+"""
+Video Metadata Cache Module
+
+This module provides a small disk-backed TTL cache for YouTube video metadata,
+so repeated lookups of the same video do not trigger a new yt-dlp extraction.
+Entries are keyed by video ID and stored as one JSON file per video.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+# Initialize logger
+logger = logging.getLogger("metadata_cache")
+
+# Constants for metadata cache configuration
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent.parent / ".cache" / "yt_audio_dl" / "metadata"
+DEFAULT_TTL_SECONDS = 24 * 3600  # 1 day
+DEFAULT_MAX_MEMORY_ENTRIES = 1024  # Least recently used entries beyond this are reloaded from disk
+
+
+class MetadataCache:
+    """
+    Disk-backed TTL cache for video metadata.
+
+    Keeps the most recently used entries in memory (LRU) and persists every
+    entry to disk so it survives eviction and process restarts.
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES):
+        """
+        Initialize the metadata cache.
+
+        Args:
+            cache_dir: Directory for cache files (defaults to .cache/yt_audio_dl/metadata
+                under the project root)
+            ttl_seconds: Time-to-live for cache entries in seconds
+            max_memory_entries: Maximum number of entries kept in memory
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+
+        # In-memory LRU entries: video_id -> (expires_at, metadata)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Ensure cache directory exists
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        logger.debug(f"MetadataCache initialized: cache_dir={self.cache_dir}, "
+                     f"ttl={ttl_seconds}s")
+
+    def _entry_path(self, video_id: str) -> Path:
+        """Get the cache file path for a video ID."""
+        return self.cache_dir / f"{video_id}.json"
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached metadata for a video.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Cached metadata dictionary or None if missing or expired
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is not None:
+                self._entries.move_to_end(video_id)
+
+        if entry is None:
+            entry = self._load_entry(video_id)
+            if entry is None:
+                return None
+            with self._lock:
+                self._remember(video_id, entry)
+
+        expires_at, metadata = entry
+        if now >= expires_at:
+            logger.debug(f"Metadata cache entry expired: {video_id}")
+            self.invalidate(video_id)
+            return None
+
+        logger.debug(f"Metadata cache hit: {video_id}")
+        return dict(metadata)
+
+    def set(self, video_id: str, metadata: Dict[str, Any]):
+        """
+        Store metadata for a video.
+
+        Args:
+            video_id: YouTube video ID
+            metadata: JSON-serializable metadata dictionary
+        """
+        expires_at = time.time() + self.ttl_seconds
+
+        with self._lock:
+            self._remember(video_id, (expires_at, dict(metadata)))
+
+        try:
+            self._entry_path(video_id).write_text(
+                json.dumps({'expires_at': expires_at, 'metadata': metadata}),
+                encoding='utf-8'
+            )
+        except (OSError, TypeError, ValueError) as e:
+            # Disk persistence is best-effort; the in-memory entry still applies
+            logger.warning(f"Could not persist metadata cache entry {video_id}: {e}")
+
+    def _remember(self, video_id: str, entry: Tuple[float, Dict[str, Any]]):
+        """Store an in-memory entry, evicting the least recently used (lock held)."""
+        self._entries[video_id] = entry
+        self._entries.move_to_end(video_id)
+        while len(self._entries) > self.max_memory_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, video_id: str):
+        """
+        Remove cached metadata for a video.
+
+        Args:
+            video_id: YouTube video ID
+        """
+        with self._lock:
+            self._entries.pop(video_id, None)
+
+        try:
+            self._entry_path(video_id).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove metadata cache entry {video_id}: {e}")
+
+    def clear(self):
+        """Remove all cached metadata."""
+        with self._lock:
+            self._entries.clear()
+
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                entry_path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove metadata cache file {entry_path}: {e}")
+
+        logger.info("Metadata cache cleared")
+
+    def _load_entry(self, video_id: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Load a cache entry from disk."""
+        try:
+            data = json.loads(self._entry_path(video_id).read_text(encoding='utf-8'))
+            return float(data['expires_at']), data['metadata']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable metadata cache entry {video_id}: {e}")
+            return None
+
+
+# Global cache instance
+_global_cache: Optional[MetadataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Get the global metadata cache instance."""
+    global _global_cache
+
+    if _global_cache is None:
+        with _cache_lock:
+            if _global_cache is None:
+                _global_cache = MetadataCache()
+
+    return _global_cache
+
+
+def clear_metadata_cache():
+    """Clear the global metadata cache."""
+    get_metadata_cache().clear()
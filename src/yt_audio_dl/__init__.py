@@ -3,14 +3,39 @@ Audio download module for YouTube downloader.
 
 This module provides audio download functionality using yt-dlp,
 integrated with the multiuser session management system.
+
+Public names are resolved lazily (PEP 562) so that importing the package
+does not pull in yt-dlp or the CLI until they are actually used.
 """
 
-from .audio_core import AudioDownloader, AudioDownloadResult, AudioDownloadError
-from .audio_core_cli import AudioDownloadCLI
+from importlib import import_module
+
+# Maps each public name to the submodule that defines it
+_LAZY_EXPORTS = {
+    'AudioDownloader': '.audio_core',
+    'AudioDownloadResult': '.audio_core',
+    'AudioDownloadError': '.audio_core',
+    'AudioDownloadCLI': '.audio_core_cli',
+}
 
 __all__ = [
     'AudioDownloader',
-    'AudioDownloadResult', 
+    'AudioDownloadResult',
     'AudioDownloadError',
     'AudioDownloadCLI'
 ]
+
+
+def __getattr__(name):
+    """Import public names on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
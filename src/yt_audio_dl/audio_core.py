@@ -5,13 +5,25 @@ This module provides the main audio download engine with progress tracking,
 error handling, and integration with the session management system.
 """
 
+import copy
 import logging
+import os
+import re
+import secrets
+import shutil
+import subprocess
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from src.common.app_config import is_metadata_caching_enabled
 from src.common.download_monitor import get_global_monitor
+from src.common.metadata_cache import MetadataCache, get_metadata_cache
 from src.common.url_utils import sanitize_youtube_url, YouTubeURLError
-from typing import Optional, Dict, Any, Callable, Union
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
 from pathlib import Path
-from dataclasses import dataclass
+from types import MappingProxyType
+from dataclasses import dataclass, replace
 from enum import Enum
 
 import yt_dlp
@@ -23,6 +35,83 @@ logger = logging.getLogger("audio_core")
 DEFAULT_QUALITY = "best"
 DEFAULT_FORMAT = "mp3"
 DEFAULT_BITRATE = "192"  # kbps
+DEFAULT_BATCH_WORKERS = 4  # Concurrent downloads for download_audio_batch
+DEFAULT_PIPELINE_DOWNLOAD_WORKERS = 2  # Network workers for download_audio_pipelined
+DEFAULT_CONCURRENT_FRAGMENTS = 4  # Parallel DASH/HLS fragment downloads
+DEFAULT_HTTP_CHUNK_SIZE = 10 * 1024 * 1024  # 10 MB HTTP Range requests
+PROGRESS_CALLBACK_INTERVAL = 0.1  # Minimum seconds between 'downloading' callbacks
+
+# Characters removed from titles when building filenames: anything other than
+# (Unicode) letters, digits, spaces, hyphens and underscores
+_FILENAME_SANITIZE_RE = re.compile(r'[^\w \-]+')
+MAX_FILENAME_TITLE_LENGTH = 50
+
+# Network-related error patterns for yt-dlp download errors
+_NETWORK_ERROR_RE = re.compile('|'.join(map(re.escape, [
+    'failed to resolve', 'getaddrinfo failed', 'network is unreachable',
+    'connection timed out', 'connection refused', 'connection reset',
+    'unable to download webpage', 'http error 5', 'bytes read', 'more expected',
+    'connection broken', 'incomplete read', 'partial download', 'download interrupted'
+])), re.IGNORECASE)
+
+# Network-related patterns for unexpected exceptions
+_NETWORK_EXCEPTION_RE = re.compile('|'.join(map(re.escape, [
+    'gaierror', 'socket.gaierror', 'connectionerror', 'timeout',
+    'failed to resolve', 'network', 'connection'
+])), re.IGNORECASE)
+
+# yt-dlp info fields kept in video info (and the metadata cache); every key is
+# always present so callers can index it directly
+_METADATA_KEYS = (
+    'id', 'title', 'uploader', 'duration', 'upload_date',
+    'view_count', 'description', 'thumbnail', 'webpage_url',
+)
+
+# URL validation cache settings
+VALIDATION_CACHE_SIZE = 4096
+VALIDATION_TTL_SECONDS = 3600  # Valid URLs
+NEGATIVE_VALIDATION_TTL_SECONDS = 300  # Invalid URLs, kept short in case of transient errors
+
+# In-memory cache of full yt-dlp info for repeated downloads; small because
+# each entry holds a full formats list, short TTL because stream URLs expire
+INFO_CACHE_SIZE = 16
+INFO_CACHE_TTL_SECONDS = 600
+
+# yt-dlp options for metadata extraction without downloading
+INFO_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': False,
+    'noplaylist': True,
+}
+
+# Static yt-dlp download options; _get_ydl_opts copies and patches per call
+_YDL_OPTS_TEMPLATE = MappingProxyType({
+    'format': DEFAULT_QUALITY,
+    'extractaudio': True,
+    'audioformat': DEFAULT_FORMAT,
+    'noplaylist': True,  # Download single video, not playlist
+    'ignoreerrors': False,
+    'no_warnings': False,
+    'extract_flat': False,
+    'writethumbnail': False,
+    'writeinfojson': False,
+    'writesubtitles': False,
+    'writeautomaticsub': False,
+    'http_chunk_size': DEFAULT_HTTP_CHUNK_SIZE,  # Resumable range requests
+})
+
+_POSTPROCESSOR_EXTRACT_AUDIO = MappingProxyType({
+    'key': 'FFmpegExtractAudio',
+    'preferredcodec': DEFAULT_FORMAT,
+    'preferredquality': DEFAULT_BITRATE,
+})
+
+# Arguments for supported external downloaders
+EXTERNAL_DOWNLOADER_ARGS = {
+    # 16 parallel connections with 1 MB range chunks
+    'aria2c': ['-x', '16', '-s', '16', '-k', '1M', '--file-allocation=none'],
+}
 
 
 class DownloadStatus(Enum):
@@ -35,9 +124,9 @@ class DownloadStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AudioDownloadResult:
-    """Result of an audio download operation."""
+    """Result of an audio download operation (immutable; use dataclasses.replace to derive)."""
     success: bool
     status: DownloadStatus
     output_path: Optional[Path] = None
@@ -66,12 +155,13 @@ class ProgressHook:
         self.downloaded_bytes = 0
         self.eta = None
         self.speed = None
+        self._last_callback_time = None
     
     def __call__(self, d):
         """Progress hook callback."""
         if d['status'] == 'downloading':
             if self.start_time is None:
-                self.start_time = time.time()
+                self.start_time = time.monotonic()
             
             # Extract progress information
             if 'total_bytes' in d and d['total_bytes']:
@@ -91,22 +181,28 @@ class ProgressHook:
             self.speed = d.get('speed')
             self.eta = d.get('eta')
             
-            # Call progress callback if provided
+            # Call progress callback if provided, throttled since yt-dlp reports
+            # progress many times per second
             if self.progress_callback:
-                self.progress_callback({
-                    'status': 'downloading',
-                    'progress_percent': progress_percent,
-                    'downloaded_bytes': self.downloaded_bytes,
-                    'total_bytes': self.total_bytes,
-                    'speed': self.speed,
-                    'eta': self.eta
-                })
+                now = time.monotonic()
+                if (self._last_callback_time is None or
+                        now - self._last_callback_time >= PROGRESS_CALLBACK_INTERVAL):
+                    self._last_callback_time = now
+                    self.progress_callback({
+                        'status': 'downloading',
+                        'progress_percent': progress_percent,
+                        'downloaded_bytes': self.downloaded_bytes,
+                        'total_bytes': self.total_bytes,
+                        'speed': self.speed,
+                        'eta': self.eta
+                    })
             
-            if progress_percent is not None:
-                logger.debug(f"Download progress: {progress_percent:.1f}% "
-                            f"({self.downloaded_bytes}/{self.total_bytes} bytes)")
-            else:
-                logger.debug(f"Download progress: {self.downloaded_bytes} bytes downloaded")
+            if logger.isEnabledFor(logging.DEBUG):
+                if progress_percent is not None:
+                    logger.debug(f"Download progress: {progress_percent:.1f}% "
+                                f"({self.downloaded_bytes}/{self.total_bytes} bytes)")
+                else:
+                    logger.debug(f"Download progress: {self.downloaded_bytes} bytes downloaded")
         
         elif d['status'] == 'finished':
             logger.info(f"Download finished: {d['filename']}")
@@ -129,21 +225,56 @@ class AudioDownloader:
     
     def __init__(self, 
                  output_dir: Union[str, Path],
-                 progress_callback: Optional[Callable] = None):
+                 progress_callback: Optional[Callable] = None,
+                 metadata_cache: Optional[MetadataCache] = None,
+                 concurrent_fragments: int = DEFAULT_CONCURRENT_FRAGMENTS,
+                 external_downloader: Optional[str] = None):
         """
         Initialize the audio downloader.
         
         Args:
             output_dir: Directory to save downloaded files
             progress_callback: Optional callback for progress updates
+            metadata_cache: Optional metadata cache (defaults to the global cache
+                when metadata caching is enabled in the app config)
+            concurrent_fragments: Number of stream fragments to download in parallel
+            external_downloader: Optional external downloader executable (e.g. 'aria2c');
+                ignored if it is not installed
         """
         self.output_dir = Path(output_dir)
         self.quality = DEFAULT_QUALITY
         self.format = DEFAULT_FORMAT
         self.progress_callback = progress_callback
+        self.concurrent_fragments = concurrent_fragments
+        
+        # Fall back to the built-in downloader if the external one is missing
+        if external_downloader and shutil.which(external_downloader) is None:
+            logger.warning(f"External downloader '{external_downloader}' not found, "
+                           f"using built-in downloader")
+            external_downloader = None
+        self.external_downloader = external_downloader
+        
+        # Pooled yt-dlp instances for info extraction, one per thread since
+        # YoutubeDL is not thread-safe; reused to keep HTTP connections alive
+        # and released once their thread exits
+        self._pooled_ydls: Dict[threading.Thread, yt_dlp.YoutubeDL] = {}
+        self._ydl_lock = threading.Lock()
+        
+        # LRU cache of validation results: clean_url -> (expires_at, is_valid)
+        self._validation_cache: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self._validation_lock = threading.Lock()
+        
+        # LRU cache of full yt-dlp info: video_id -> (expires_at, info)
+        self._info_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._info_cache_lock = threading.Lock()
         
         # Initialize download monitor
         self.monitor = get_global_monitor()
+        
+        # Initialize metadata cache
+        if metadata_cache is None and is_metadata_caching_enabled():
+            metadata_cache = get_metadata_cache()
+        self.metadata_cache = metadata_cache
 
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -151,42 +282,69 @@ class AudioDownloader:
         logger.info(f"AudioDownloader initialized: output_dir={self.output_dir}, "
                    f"quality={DEFAULT_QUALITY}, format={DEFAULT_FORMAT}")
     
-    def _get_ydl_opts(self, output_template: str) -> Dict[str, Any]:
+    def _get_ydl_opts(self,
+                      output_template: str,
+                      extract_audio: bool = True,
+                      output_dir_override: Optional[Path] = None) -> Dict[str, Any]:
         """
         Get yt-dlp options for audio download.
         
         Args:
             output_template: Template for output filename
+            extract_audio: Whether yt-dlp should convert the download to MP3
+            output_dir_override: Optional directory to use instead of output_dir
             
         Returns:
             Dictionary of yt-dlp options configured for best quality MP3 download
         """
-        return {
-            'format': self.quality,
-            'outtmpl': str(self.output_dir / output_template),
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': self.format,
-                'preferredquality': DEFAULT_BITRATE,
-            }],
-            'extractaudio': True,
-            'audioformat': self.format,
-            'noplaylist': True,  # Download single video, not playlist
-            'ignoreerrors': False,
-            'no_warnings': False,
-            'extract_flat': False,
-            'writethumbnail': False,
-            'writeinfojson': False,
-            'writesubtitles': False,
-            'writeautomaticsub': False,
+        opts = {
+            **_YDL_OPTS_TEMPLATE,
+            'outtmpl': str((output_dir_override or self.output_dir) / output_template),
+            'postprocessors': [dict(_POSTPROCESSOR_EXTRACT_AUDIO)],
+            'concurrent_fragment_downloads': self.concurrent_fragments,
         }
+        
+        if not extract_audio:
+            # Keep the downloaded stream as-is; conversion happens separately
+            opts['postprocessors'] = []
+            del opts['extractaudio'], opts['audioformat']
+        
+        if self.external_downloader:
+            opts['external_downloader'] = self.external_downloader
+            downloader_args = EXTERNAL_DOWNLOADER_ARGS.get(self.external_downloader)
+            if downloader_args:
+                opts['external_downloader_args'] = {self.external_downloader: downloader_args}
+        
+        return opts
+    
+    def _get_cache_key(self, url: str) -> Optional[str]:
+        """
+        Get the metadata cache key (video ID) for a URL.
+        
+        Args:
+            url: YouTube video URL
+            
+        Returns:
+            Video ID, or None if caching is disabled or the URL cannot be parsed
+        """
+        if self.metadata_cache is None:
+            return None
+        
+        try:
+            return sanitize_youtube_url(url, preserve_metadata=False).video_id
+        except YouTubeURLError:
+            return None
     
-    def get_video_info(self, url: str) -> Dict[str, Any]:
+    def get_video_info(self, url: str, include_formats: bool = False) -> Dict[str, Any]:
         """
         Get video information without downloading.
         
+        Results are served from the metadata cache when it is enabled.
+        
         Args:
             url: YouTube video URL
+            include_formats: Whether to include the full formats list
+                (bypasses the metadata cache)
             
         Returns:
             Dictionary with video information
@@ -194,47 +352,183 @@ class AudioDownloader:
         Raises:
             AudioDownloadError: If unable to extract video info
         """
+        cache_key = None if include_formats else self._get_cache_key(url)
+        if cache_key:
+            cached_info = self.metadata_cache.get(cache_key)
+            if cached_info is not None:
+                logger.debug(f"Using cached video info for: {url}")
+                return cached_info
+        
         try:
             logger.debug(f"Getting video info for: {url}")
             
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,
-                'noplaylist': True,
-            }
+            info = self._extract_info(url)
+            video_info = self._build_video_info(info, include_formats=include_formats)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                if not info:
-                    raise AudioDownloadError("Unable to extract video information")
-                
-                # Extract relevant information
-                video_info = {
-                    'id': info.get('id'),
-                    'title': info.get('title'),
-                    'uploader': info.get('uploader'),
-                    'duration': info.get('duration'),
-                    'upload_date': info.get('upload_date'),
-                    'view_count': info.get('view_count'),
-                    'description': info.get('description'),
-                    'thumbnail': info.get('thumbnail'),
-                    'webpage_url': info.get('webpage_url'),
-                    'formats': info.get('formats', [])
-                }
-                
-                logger.debug(f"Video info extracted: {video_info['title']}")
-                return video_info
+            if cache_key:
+                self.metadata_cache.set(cache_key, video_info)
+            
+            logger.debug(f"Video info extracted: {video_info['title']}")
+            return video_info
                 
         except Exception as e:
             logger.error(f"Error getting video info for {url}: {e}")
             raise AudioDownloadError(f"Failed to get video info: {e}")
     
+    def _extract_info(self, url: str) -> Dict[str, Any]:
+        """
+        Run a yt-dlp extraction without downloading.
+        
+        Args:
+            url: YouTube video URL
+            
+        Returns:
+            Full yt-dlp info dictionary
+            
+        Raises:
+            AudioDownloadError: If yt-dlp returns no information
+        """
+        info = self._get_info_ydl().extract_info(url, download=False)
+        
+        if not info:
+            raise AudioDownloadError("Unable to extract video information")
+        
+        return info
+    
+    def _get_info_ydl(self) -> yt_dlp.YoutubeDL:
+        """
+        Get the pooled yt-dlp instance used for info extraction.
+        
+        Returns:
+            YoutubeDL instance owned by the calling thread
+        """
+        thread = threading.current_thread()
+        with self._ydl_lock:
+            ydl = self._pooled_ydls.get(thread)
+        
+        if ydl is None:
+            self._release_dead_ydls()
+            # Entered here and exited in _release_dead_ydls() or close()
+            ydl = yt_dlp.YoutubeDL(dict(INFO_YDL_OPTS)).__enter__()
+            with self._ydl_lock:
+                self._pooled_ydls[thread] = ydl
+        return ydl
+    
+    def _release_dead_ydls(self):
+        """Close pooled yt-dlp instances whose owning thread has exited."""
+        with self._ydl_lock:
+            dead_threads = [thread for thread in self._pooled_ydls if not thread.is_alive()]
+            dead_ydls = [self._pooled_ydls.pop(thread) for thread in dead_threads]
+        self._close_ydls(dead_ydls)
+    
+    @staticmethod
+    def _close_ydls(ydls: List[yt_dlp.YoutubeDL]):
+        """Exit yt-dlp instances, releasing their HTTP connections."""
+        for ydl in ydls:
+            try:
+                ydl.__exit__(None, None, None)
+            except Exception as e:
+                logger.debug(f"Error closing yt-dlp instance: {e}")
+    
+    def close(self):
+        """Close pooled yt-dlp instances and release their connections."""
+        with self._ydl_lock:
+            pooled_ydls = list(self._pooled_ydls.values())
+            self._pooled_ydls.clear()
+        self._close_ydls(pooled_ydls)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _build_video_info(self, info: Dict[str, Any], include_formats: bool = False) -> Dict[str, Any]:
+        """
+        Build the video information dictionary from a yt-dlp info dictionary.
+        
+        Args:
+            info: Full yt-dlp info dictionary
+            include_formats: Whether to include the full formats list
+            
+        Returns:
+            Dictionary with the relevant video information
+        """
+        video_info = {key: info.get(key) for key in _METADATA_KEYS}
+        if include_formats:
+            video_info['formats'] = info.get('formats', [])
+        
+        return video_info
+    
+    def invalidate_metadata(self, url: str):
+        """
+        Drop cached metadata for a URL.
+        
+        Args:
+            url: YouTube video URL
+        """
+        try:
+            video_id = sanitize_youtube_url(url, preserve_metadata=False).video_id
+        except YouTubeURLError:
+            return
+        
+        self._invalidate_download_info(video_id)
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate(video_id)
+        logger.debug(f"Invalidated cached video info for: {url}")
+    
+    def _get_download_info(self, video_id: str, clean_url: str) -> Dict[str, Any]:
+        """
+        Get full yt-dlp info for a download, reusing a recent extraction.
+        
+        A repeated download of the same video skips the extraction
+        round-trips. yt-dlp mutates the info while downloading, so each
+        extraction is copied once into the cache and a cached entry is handed
+        out (and removed) by the next download of that video.
+        
+        Args:
+            video_id: YouTube video ID
+            clean_url: Sanitized YouTube URL
+            
+        Returns:
+            Full yt-dlp info dictionary
+        """
+        now = time.monotonic()
+        
+        with self._info_cache_lock:
+            cached = self._info_cache.pop(video_id, None)
+        if cached is not None and now < cached[0]:
+            logger.debug(f"Reusing extracted info for: {video_id}")
+            return cached[1]
+        
+        info = self._extract_info(clean_url)
+        
+        with self._info_cache_lock:
+            self._info_cache[video_id] = (now + INFO_CACHE_TTL_SECONDS, copy.deepcopy(info))
+            if len(self._info_cache) > INFO_CACHE_SIZE:
+                self._info_cache.popitem(last=False)
+        
+        return info
+    
+    def _invalidate_download_info(self, video_id: str):
+        """Drop cached yt-dlp info for a video."""
+        with self._info_cache_lock:
+            self._info_cache.pop(video_id, None)
+    
     def download_audio(self, 
                       url: str, 
                       output_filename: Optional[str] = None,
-                      metadata: Optional[Dict[str, Any]] = None) -> AudioDownloadResult:
+                      metadata: Optional[Dict[str, Any]] = None,
+                      *,
+                      extract_audio: bool = True,
+                      output_dir_override: Optional[Path] = None,
+                      progress_callback: Optional[Callable] = None) -> AudioDownloadResult:
         """
         Download audio from a YouTube URL.
         
@@ -242,6 +536,11 @@ class AudioDownloader:
             url: YouTube video URL
             output_filename: Optional custom output filename
             metadata: Optional metadata to embed in the file
+            extract_audio: Convert the download to MP3; when False the original
+                stream is kept for a separate conversion step
+            output_dir_override: Optional directory to save to instead of output_dir
+            progress_callback: Optional progress callback for this download
+                (defaults to the downloader's progress_callback)
             
         Returns:
             AudioDownloadResult with download information
@@ -249,28 +548,30 @@ class AudioDownloader:
         Raises:
             AudioDownloadError: If download fails
         """
-        start_time = time.time()
-        download_id = f"download_{int(start_time)}_{hash(url) % 10000}"
+        start_time = time.monotonic()
+        logger.info(f"Starting audio download: {url}")
+        
+        # Sanitize URL first
+        try:
+            url_info = sanitize_youtube_url(url, preserve_metadata=True)
+            clean_url = url_info.clean_url
+            logger.debug(f"URL sanitized: {url} -> {clean_url}")
+            if url_info.timestamp:
+                logger.debug(f"Timestamp detected: {url_info.timestamp}s (note: timestamp will be ignored for full download)")
+        except YouTubeURLError as e:
+            logger.error(f"Invalid YouTube URL: {e}")
+            return AudioDownloadResult(
+                success=False,
+                status=DownloadStatus.FAILED,
+                error_message=f"Invalid YouTube URL: {e}",
+                download_time_seconds=0
+            )
+        
+        # Key the download by video rather than raw URL; the random suffix keeps
+        # concurrent downloads of the same video apart
+        download_id = f"download_{url_info.video_id}_{secrets.token_hex(4)}"
         
         try:
-            logger.info(f"Starting audio download: {url}")
-            
-            # Sanitize URL first
-            try:
-                url_info = sanitize_youtube_url(url, preserve_metadata=True)
-                clean_url = url_info.clean_url
-                logger.debug(f"URL sanitized: {url} -> {clean_url}")
-                if url_info.timestamp:
-                    logger.debug(f"Timestamp detected: {url_info.timestamp}s (note: timestamp will be ignored for full download)")
-            except YouTubeURLError as e:
-                logger.error(f"Invalid YouTube URL: {e}")
-                return AudioDownloadResult(
-                    success=False,
-                    status=DownloadStatus.FAILED,
-                    error_message=f"Invalid YouTube URL: {e}",
-                    download_time_seconds=0
-                )
-            
             # Start monitoring
             if not self.monitor.start_download_monitoring(download_id, clean_url):
                 logger.error("Failed to start download monitoring - network issues detected")
@@ -281,12 +582,18 @@ class AudioDownloader:
                     download_time_seconds=0
                 )
             
-            # Get video info first
+            # Extract video info once; the download below reuses it instead of
+            # running a second extraction
+            info = None
             try:
-                video_info = self.get_video_info(clean_url)
+                info = self._get_download_info(url_info.video_id, clean_url)
+                video_info = self._build_video_info(info)
                 title = video_info.get('title', 'Unknown')
                 duration = video_info.get('duration', 0)
-            except AudioDownloadError as e:
+                
+                if self.metadata_cache is not None:
+                    self.metadata_cache.set(url_info.video_id, video_info)
+            except Exception as e:
                 # Handle network errors gracefully
                 if "Failed to resolve" in str(e) or "getaddrinfo failed" in str(e):
                     logger.error(f"Network error detected: {e}")
@@ -295,10 +602,12 @@ class AudioDownloader:
                         success=False,
                         status=DownloadStatus.FAILED,
                         error_message="Network error: Unable to connect to YouTube. Please check your internet connection.",
-                        download_time_seconds=time.time() - start_time
+                        download_time_seconds=time.monotonic() - start_time
                     )
                 else:
                     # Other errors, proceed with download anyway
+                    logger.warning(f"Could not extract video info, downloading without it: {e}")
+                    info = None
                     title = "Unknown"
                     duration = 0
                     video_info = {}
@@ -306,12 +615,16 @@ class AudioDownloader:
             # Generate output filename if not provided
             if not output_filename:
                 # Sanitize title for filename
-                safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-                safe_title = safe_title[:50]  # Limit length
+                safe_title = _FILENAME_SANITIZE_RE.sub('', title).strip()
+                safe_title = safe_title[:MAX_FILENAME_TITLE_LENGTH]  # Limit length
                 output_filename = f"{safe_title}.%(ext)s"
             
             # Set up yt-dlp options
-            ydl_opts = self._get_ydl_opts(output_filename)
+            ydl_opts = self._get_ydl_opts(
+                output_filename,
+                extract_audio=extract_audio,
+                output_dir_override=output_dir_override
+            )
             
             # Add metadata if provided
             if metadata:
@@ -321,120 +634,97 @@ class AudioDownloader:
                     'add_chapters': False,
                 })
             
-            # Download the audio
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                logger.debug(f"Downloading with yt-dlp options: {ydl_opts}")
-                
-                # Add progress hook for monitoring
-                def progress_hook(d):
-                    if d['status'] == 'downloading':
-                        self.monitor.update_download_progress(download_id, d)
-                    elif d['status'] == 'finished':
-                        logger.info(f"Download finished: {d['filename']}")
-                
-                ydl.add_progress_hook(progress_hook)
-                
-                # Extract info and download using clean URL
-                info = ydl.extract_info(clean_url, download=True)
-                
-                if not info:
-                    self.monitor.complete_download(download_id, False, "Download failed - no info extracted")
-                    raise AudioDownloadError("Download failed - no info extracted")
-                
-                # Find the downloaded file
-                downloaded_files = []
-                for file_path in self.output_dir.glob("*"):
-                    if file_path.is_file() and file_path.suffix.lstrip('.') == self.format:
-                        downloaded_files.append(file_path)
-                
-                if not downloaded_files:
-                    self.monitor.complete_download(download_id, False, "Download completed but no output file found")
-                    raise AudioDownloadError("Download completed but no output file found")
-                
-                # Use the most recently modified file (should be our download)
-                output_file = max(downloaded_files, key=lambda f: f.stat().st_mtime)
-                
-                # Get file size
-                file_size = output_file.stat().st_size
-                download_time = time.time() - start_time
-                
-                # Complete monitoring
-                self.monitor.complete_download(download_id, True)
-                
-                logger.info(f"Audio download completed: {output_file} ({file_size} bytes, "
-                           f"{download_time:.1f}s)")
-                
-                return AudioDownloadResult(
-                    success=True,
-                    status=DownloadStatus.COMPLETED,
-                    output_path=output_file,
-                    file_size_bytes=file_size,
-                    duration_seconds=duration,
-                    title=title,
-                    artist=video_info.get('uploader'),
-                    format=self.format,
-                    download_time_seconds=download_time,
-                    metadata=video_info
-                )
-                
+            # Download the audio, retrying network errors after the jittered
+            # exponential backoff delay the monitor picks (it owns retry policy)
+            while True:
+                try:
+                    info, final_path = self._run_download(
+                        ydl_opts, info, clean_url, download_id,
+                        progress_callback or self.progress_callback
+                    )
+                    break
+                except yt_dlp.DownloadError as e:
+                    if not _NETWORK_ERROR_RE.search(str(e)):
+                        raise
+                    if not self.monitor.handle_network_error(download_id, e):
+                        raise
+                    time.sleep(self.monitor.get_retry_delay(download_id))
+            
+            if not info:
+                self.monitor.complete_download(download_id, False, "Download failed - no info extracted")
+                raise AudioDownloadError("Download failed - no info extracted")
+            
+            # Prefer the path recorded by yt-dlp after post-processing
+            requested_downloads = info.get('requested_downloads')
+            if isinstance(requested_downloads, list) and requested_downloads:
+                final_path = requested_downloads[-1].get('filepath') or final_path
+            
+            # Find the downloaded file
+            output_file = self._resolve_output_file(final_path, output_dir_override)
+            
+            if output_file is None:
+                self.monitor.complete_download(download_id, False, "Download completed but no output file found")
+                raise AudioDownloadError("Download completed but no output file found")
+            
+            # Get file size
+            file_size = output_file.stat().st_size
+            download_time = time.monotonic() - start_time
+            
+            # Complete monitoring
+            self.monitor.complete_download(download_id, True)
+            
+            logger.info(f"Audio download completed: {output_file} ({file_size} bytes, "
+                       f"{download_time:.1f}s)")
+            
+            return AudioDownloadResult(
+                success=True,
+                status=DownloadStatus.COMPLETED,
+                output_path=output_file,
+                file_size_bytes=file_size,
+                duration_seconds=duration,
+                title=title,
+                artist=video_info.get('uploader'),
+                format=self.format if extract_audio else output_file.suffix.lstrip('.'),
+                download_time_seconds=download_time,
+                metadata=video_info
+            )
+            
         except yt_dlp.DownloadError as e:
-            error_str = str(e).lower()
             logger.error(f"yt-dlp download error for {url}: {e}")
             
             # Check for network-related errors and provide user-friendly messages
-            if any(network_error in error_str for network_error in [
-                'failed to resolve', 'getaddrinfo failed', 'network is unreachable',
-                'connection timed out', 'connection refused', 'connection reset',
-                'unable to download webpage', 'http error 5', 'bytes read', 'more expected',
-                'connection broken', 'incomplete read', 'partial download', 'download interrupted'
-            ]):
-                # Try to handle network error with retry logic
-                retry_should_happen = self.monitor.handle_network_error(download_id, e)
-                logger.info(f"Monitor retry decision for {download_id}: {retry_should_happen}")
-                
-                if retry_should_happen:
-                    logger.info(f"Retrying download {download_id} after network error")
-                    # Return a special status to indicate retry should be attempted
-                    return AudioDownloadResult(
-                        success=False,
-                        status=DownloadStatus.PENDING,
-                        error_message=f"Network connectivity issue detected (attempt {self.monitor.active_downloads.get(download_id, type('', (), {'retry_count': 0})).retry_count}). Retrying...",
-                        download_time_seconds=time.time() - start_time
-                    )
-                else:
-                    # Max retries exceeded
-                    user_friendly_message = (
-                        "Network connectivity issues prevented the download. "
-                        "This could be due to:\n"
-                        "• Temporary internet connection problems\n"
-                        "• DNS resolution failures\n"
-                        "• YouTube server access issues\n"
-                        "Please check your internet connection and try again later."
-                    )
-                    return AudioDownloadResult(
-                        success=False,
-                        status=DownloadStatus.FAILED,
-                        error_message=user_friendly_message,
-                        download_time_seconds=time.time() - start_time
-                    )
+            if _NETWORK_ERROR_RE.search(str(e)):
+                # Retries were exhausted above; the monitor has already recorded the failure
+                user_friendly_message = (
+                    "Network connectivity issues prevented the download. "
+                    "This could be due to:\n"
+                    "• Temporary internet connection problems\n"
+                    "• DNS resolution failures\n"
+                    "• YouTube server access issues\n"
+                    "Please check your internet connection and try again later."
+                )
+                return AudioDownloadResult(
+                    success=False,
+                    status=DownloadStatus.FAILED,
+                    error_message=user_friendly_message,
+                    download_time_seconds=time.monotonic() - start_time
+                )
             else:
-                # Non-network related yt-dlp error
+                # Non-network related yt-dlp error; the cached info (e.g. expired
+                # stream URLs) may be the cause, so extract it again next time
+                self._invalidate_download_info(url_info.video_id)
                 self.monitor.complete_download(download_id, False, f"Download error: {e}")
                 return AudioDownloadResult(
                     success=False,
                     status=DownloadStatus.FAILED,
                     error_message=f"Download error: {e}",
-                    download_time_seconds=time.time() - start_time
+                    download_time_seconds=time.monotonic() - start_time
                 )
         except Exception as e:
-            error_str = str(e).lower()
             logger.error(f"Unexpected error during audio download for {url}: {e}")
             
             # Check for network-related exceptions
-            if any(network_error in error_str for network_error in [
-                'gaierror', 'socket.gaierror', 'connectionerror', 'timeout',
-                'failed to resolve', 'network', 'connection'
-            ]):
+            if _NETWORK_EXCEPTION_RE.search(str(e)):
                 user_friendly_message = (
                     "A network error occurred during download. This is usually temporary. "
                     "Please check your internet connection and try again."
@@ -444,17 +734,114 @@ class AudioDownloader:
                     success=False,
                     status=DownloadStatus.FAILED,
                     error_message=user_friendly_message,
-                    download_time_seconds=time.time() - start_time
+                    download_time_seconds=time.monotonic() - start_time
                 )
             else:
+                self._invalidate_download_info(url_info.video_id)
                 self.monitor.complete_download(download_id, False, f"Unexpected error: {e}")
                 return AudioDownloadResult(
                     success=False,
                     status=DownloadStatus.FAILED,
                     error_message=f"Unexpected error: {e}",
-                    download_time_seconds=time.time() - start_time
+                    download_time_seconds=time.monotonic() - start_time
                 )
         
+    def _run_download(self,
+                      ydl_opts: Dict[str, Any],
+                      info: Optional[Dict[str, Any]],
+                      clean_url: str,
+                      download_id: str,
+                      progress_callback: Optional[Callable] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Run a single yt-dlp download attempt.
+        
+        Args:
+            ydl_opts: yt-dlp options
+            info: Previously extracted video info, or None to extract it now
+            clean_url: Sanitized YouTube URL
+            download_id: Download identifier for monitoring
+            progress_callback: Optional callback receiving ProgressHook updates
+            
+        Returns:
+            Tuple of (info dictionary after download, output path reported by yt-dlp)
+            
+        Raises:
+            yt_dlp.DownloadError: If yt-dlp fails to download
+        """
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            logger.debug(f"Downloading with yt-dlp options: {ydl_opts}")
+            
+            # Output path as reported by yt-dlp, updated after post-processing
+            final_path = None
+            
+            # Add progress hook for monitoring
+            def progress_hook(d):
+                nonlocal final_path
+                if d['status'] == 'downloading':
+                    self.monitor.update_download_progress(download_id, d)
+                elif d['status'] == 'finished':
+                    logger.info(f"Download finished: {d['filename']}")
+                    final_path = d.get('info_dict', {}).get('filepath') or d['filename']
+            
+            # Track the file handed to each post-processor; the last one (MoveFiles)
+            # receives the converted audio file
+            def postprocessor_hook(d):
+                nonlocal final_path
+                final_path = d.get('info_dict', {}).get('filepath') or final_path
+            
+            ydl.add_progress_hook(progress_hook)
+            ydl.add_postprocessor_hook(postprocessor_hook)
+            if progress_callback:
+                ydl.add_progress_hook(ProgressHook(progress_callback))
+            
+            if info is not None:
+                # Download from the already-extracted info
+                info = ydl.process_ie_result(info, download=True)
+            else:
+                # Extract info and download using clean URL
+                info = ydl.extract_info(clean_url, download=True)
+        
+        return info, final_path
+    
+    def _resolve_output_file(self,
+                             reported_path: Optional[str],
+                             search_dir: Optional[Path] = None) -> Optional[Path]:
+        """
+        Resolve the output file of a finished download.
+        
+        Args:
+            reported_path: File path reported by the yt-dlp hooks
+            search_dir: Directory to scan if the reported path is missing
+                (defaults to output_dir)
+            
+        Returns:
+            Path to the downloaded file, or None if it cannot be found
+        """
+        if reported_path:
+            output_file = Path(reported_path)
+            if output_file.is_file():
+                return output_file
+            logger.debug(f"Reported output file not found, scanning output directory: {reported_path}")
+        
+        # Fall back to the most recently modified file in the output directory;
+        # scandir entries cache their file type, so only one stat per candidate
+        suffix = f".{self.format}"
+        try:
+            with os.scandir(search_dir or self.output_dir) as entries:
+                candidates = [
+                    (entry.stat().st_mtime, entry.path)
+                    for entry in entries
+                    if entry.name.endswith(suffix) and entry.is_file()
+                ]
+        except OSError as e:
+            logger.warning(f"Could not scan output directory for downloaded files: {e}")
+            return None
+        
+        if not candidates:
+            return None
+        
+        return Path(max(candidates)[1])
+    
     def download_audio_with_session(self, 
                                    url: str,
                                    session_uuid: str,
@@ -479,15 +866,13 @@ class AudioDownloader:
             session_output_dir = self.output_dir / session_uuid / job_uuid
             session_output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Create a temporary downloader with session-specific output
-            session_downloader = AudioDownloader(
-                output_dir=session_output_dir,
+            # Download the audio into the session directory with this downloader
+            result = self.download_audio(
+                url,
+                output_dir_override=session_output_dir,
                 progress_callback=progress_callback
             )
             
-            # Download the audio
-            result = session_downloader.download_audio(url)
-            
             if result.success:
                 logger.info(f"Session download completed: {result.output_path}")
             else:
@@ -503,6 +888,156 @@ class AudioDownloader:
                 error_message=f"Session download error: {e}"
             )
     
+    def download_audio_batch(self,
+                             urls: List[str],
+                             max_workers: int = DEFAULT_BATCH_WORKERS) -> List[AudioDownloadResult]:
+        """
+        Download audio from multiple URLs concurrently.
+        
+        Downloads are network-bound and yt-dlp releases the GIL during socket
+        I/O and ffmpeg waits, so a thread pool scales with available bandwidth.
+        
+        Args:
+            urls: List of YouTube video URLs
+            max_workers: Maximum number of concurrent downloads
+            
+        Returns:
+            List of AudioDownloadResult objects, in the same order as urls
+        """
+        if not urls:
+            return []
+        
+        logger.info(f"Starting batch download of {len(urls)} URLs with {max_workers} workers")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.download_audio, url) for url in urls]
+            
+            results = []
+            for url, future in zip(urls, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Batch download failed for {url}: {e}")
+                    results.append(AudioDownloadResult(
+                        success=False,
+                        status=DownloadStatus.FAILED,
+                        error_message=f"Batch download error: {e}"
+                    ))
+        
+        # The executor's worker threads have exited; drop their instances
+        self._release_dead_ydls()
+        
+        successful = sum(1 for result in results if result.success)
+        logger.info(f"Batch download complete: {successful}/{len(urls)} successful")
+        return results
+    
+    def download_audio_pipelined(self,
+                                 urls: List[str],
+                                 max_download_workers: int = DEFAULT_PIPELINE_DOWNLOAD_WORKERS) -> List[AudioDownloadResult]:
+        """
+        Download audio from multiple URLs, overlapping downloads with conversion.
+        
+        Downloads run on a small network pool without post-processing; each
+        finished download is handed to a single conversion worker, so one
+        file is converted to MP3 while the next one downloads.
+        
+        Args:
+            urls: List of YouTube video URLs
+            max_download_workers: Maximum number of concurrent downloads
+            
+        Returns:
+            List of AudioDownloadResult objects, in the same order as urls
+        """
+        if not urls:
+            return []
+        
+        logger.info(f"Starting pipelined download of {len(urls)} URLs")
+        
+        postprocess_futures: List[Optional[Future]] = [None] * len(urls)
+        
+        # One conversion worker; concurrent ffmpeg processes would only compete for CPU
+        with ThreadPoolExecutor(max_workers=1) as postprocess_executor:
+            def submit_postprocess(index: int, download_future: Future):
+                postprocess_futures[index] = postprocess_executor.submit(
+                    self._postprocess_download, download_future
+                )
+            
+            with ThreadPoolExecutor(max_workers=max_download_workers) as download_executor:
+                for index, url in enumerate(urls):
+                    download_future = download_executor.submit(self.download_audio, url, extract_audio=False)
+                    download_future.add_done_callback(
+                        lambda future, index=index: submit_postprocess(index, future)
+                    )
+            
+            results = []
+            for url, future in zip(urls, postprocess_futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Pipelined download failed for {url}: {e}")
+                    results.append(AudioDownloadResult(
+                        success=False,
+                        status=DownloadStatus.FAILED,
+                        error_message=f"Pipelined download error: {e}"
+                    ))
+        
+        # The executors' worker threads have exited; drop their instances
+        self._release_dead_ydls()
+        
+        successful = sum(1 for result in results if result.success)
+        logger.info(f"Pipelined download complete: {successful}/{len(urls)} successful")
+        return results
+    
+    def _postprocess_download(self, download_future: Future) -> AudioDownloadResult:
+        """
+        Convert a finished download to MP3 with ffmpeg.
+        
+        Args:
+            download_future: Future holding the result of an unconverted download
+            
+        Returns:
+            AudioDownloadResult pointing at the converted file
+        """
+        result = download_future.result()
+        if not result.success or result.output_path is None:
+            return result
+        
+        source = result.output_path
+        target = source.with_suffix(f".{self.format}")
+        if source == target:
+            return replace(result, format=self.format)
+        
+        start_time = time.monotonic()
+        command = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-i', str(source),
+            '-vn', '-c:a', 'libmp3lame', '-b:a', f"{DEFAULT_BITRATE}k",
+            str(target),
+        ]
+        
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            error_output = getattr(e, 'stderr', None) or e
+            logger.error(f"Audio conversion failed for {source}: {error_output}")
+            return replace(
+                result,
+                success=False,
+                status=DownloadStatus.FAILED,
+                error_message=f"Audio conversion failed: {error_output}"
+            )
+        
+        source.unlink(missing_ok=True)
+        logger.info(f"Audio conversion completed: {target}")
+        
+        return replace(
+            result,
+            output_path=target,
+            file_size_bytes=target.stat().st_size,
+            format=self.format,
+            download_time_seconds=(result.download_time_seconds or 0) + time.monotonic() - start_time
+        )
+    
     def cancel_download(self):
         """Cancel ongoing download (placeholder for future implementation)."""
         # This would require more complex implementation with threading
@@ -522,9 +1057,50 @@ class AudioDownloader:
         try:
             # Use URL sanitizer for comprehensive validation
             url_info = sanitize_youtube_url(url, preserve_metadata=False)
+        except Exception:
+            return False
+        
+        clean_url = url_info.clean_url
+        now = time.monotonic()
+        
+        with self._validation_lock:
+            cached = self._validation_cache.get(clean_url)
+            if cached is not None:
+                expires_at, is_valid = cached
+                if now < expires_at:
+                    self._validation_cache.move_to_end(clean_url)
+                    return is_valid
+                del self._validation_cache[clean_url]
+        
+        is_valid = self._validate_clean_url(clean_url, url_info.video_id)
+        
+        ttl = VALIDATION_TTL_SECONDS if is_valid else NEGATIVE_VALIDATION_TTL_SECONDS
+        with self._validation_lock:
+            self._validation_cache[clean_url] = (now + ttl, is_valid)
+            self._validation_cache.move_to_end(clean_url)
+            if len(self._validation_cache) > VALIDATION_CACHE_SIZE:
+                self._validation_cache.popitem(last=False)
+        
+        return is_valid
+    
+    def _validate_clean_url(self, clean_url: str, video_id: Optional[str]) -> bool:
+        """
+        Validate a sanitized URL with yt-dlp.
+        
+        Args:
+            clean_url: Sanitized YouTube URL
+            video_id: YouTube video ID of the URL
             
+        Returns:
+            True if yt-dlp can extract the video
+        """
+        # Cached metadata means the video was already extracted successfully
+        if self.metadata_cache and video_id and self.metadata_cache.get(video_id) is not None:
+            return True
+        
+        try:
             # Try to extract info to validate with yt-dlp
-            self.get_video_info(url_info.clean_url)
+            self.get_video_info(clean_url)
             return True
             
         except (YouTubeURLError, AudioDownloadError):
@@ -8,19 +8,34 @@ from YouTube videos with session management integration.
 import argparse
 import sys
 import logging
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
 
-# Project imports
+# Project imports (yt-dlp and the download monitor are imported where they
+# are used, so --help and --session-info start without loading them)
 from src.common import setup_logging, create_session, get_session, get_session_manager
-from .audio_core import AudioDownloader, AudioDownloadError, DownloadStatus, DEFAULT_QUALITY, DEFAULT_FORMAT
-from src.common.download_monitor import get_global_monitor
 from src.common.url_utils import sanitize_youtube_url, YouTubeURLError
 
+if TYPE_CHECKING:
+    from .audio_core import AudioDownloader
+
 # Initialize logger
 logger = logging.getLogger("audio_cli")
 
+# Number of URLs downloaded in parallel for batch downloads
+DEFAULT_CONCURRENCY = 4
+
+# Minimum seconds between progress line updates
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+# Progress line template, bound once instead of rebuilt per update
+_PROGRESS_LINE = "\rDownloading: {:.1f}% ({:.1f}/{:.1f} MB) Speed: {} bytes/s".format
+_MB_PER_BYTE = 1.0 / (1024 * 1024)
+
 
 class AudioDownloadCLI:
     """
@@ -32,25 +47,48 @@ class AudioDownloadCLI:
     
     def __init__(self):
         """Initialize the CLI interface."""
-        self.session_manager = None
+        self.session_manager = get_session_manager()
         self.session_uuid = None
+        self.user_context = None
+        
+        # Batch downloads run in worker threads: serialize session-manager
+        # updates and console output
+        self._session_lock = threading.Lock()
+        self._output_lock = threading.Lock()
+        
+        # Downloaders reused across URLs, keyed by output directory
+        self._downloaders: Dict[Path, 'AudioDownloader'] = {}
+        
+        # Resolved output directories already created by this process
+        self._ensured_dirs: Set[Path] = set()
+        
+        # In-place progress lines only make sense on a terminal
+        self._interactive = sys.stdout.isatty()
+        self._last_progress_time = 0.0
         
     def setup_logging(self, verbose: bool = False):
-        """Setup logging configuration."""
-        if verbose:
-            logging.getLogger().setLevel(logging.DEBUG)
-        else:
-            logging.getLogger().setLevel(logging.INFO)
+        """Set the CLI logger level (other loggers are left untouched)."""
+        logger.setLevel(logging.DEBUG if verbose else logging.INFO)
     
-    def create_or_get_session(self) -> str:
-        """Create or get existing session."""
+    def create_or_get_session(self, session_uuid: Optional[str] = None) -> str:
+        """
+        Create the CLI session, or return it if it already exists.
+        
+        One session is shared by every download in a CLI invocation.
+        
+        Args:
+            session_uuid: Optional UUID to reuse, e.g. to keep downloads from
+                several runs in the same session directory
+        
+        Returns:
+            Session UUID
+        """
         try:
-            if not self.session_manager:
-                self.session_manager = get_session_manager()
-            
-            # For CLI, create a new session each time
-            self.session_uuid = create_session()
-            logger.info(f"Created new session: {self.session_uuid}")
+            with self._session_lock:
+                if self.session_uuid is None:
+                    self.session_uuid = create_session(session_uuid=session_uuid)
+                    self.user_context = get_session(self.session_uuid)
+                    logger.info(f"Created new session: {self.session_uuid}")
             
             return self.session_uuid
             
@@ -58,22 +96,74 @@ class AudioDownloadCLI:
             logger.error(f"Error creating session: {e}")
             raise
     
+    def ensure_output_dir(self, output_dir: Path) -> Path:
+        """
+        Resolve an output directory and create it once per process.
+        
+        Args:
+            output_dir: Output directory for downloads
+            
+        Returns:
+            Absolute path of the output directory
+        """
+        output_dir = Path(output_dir).resolve()
+        if output_dir not in self._ensured_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(output_dir)
+        return output_dir
+    
+    def get_downloader(self, output_dir: Path) -> 'AudioDownloader':
+        """
+        Get the shared downloader for an output directory.
+        
+        Reusing one downloader keeps its pooled yt-dlp instance and URL
+        validation cache across every URL in a batch.
+        
+        Args:
+            output_dir: Output directory for downloads
+            
+        Returns:
+            AudioDownloader for the directory
+        """
+        from .audio_core import AudioDownloader
+        
+        with self._session_lock:
+            downloader = self._downloaders.get(output_dir)
+            if downloader is None:
+                downloader = AudioDownloader(
+                    output_dir=output_dir,
+                    progress_callback=self.progress_callback
+                )
+                self._downloaders[output_dir] = downloader
+            return downloader
+    
     def progress_callback(self, progress_data: dict):
         """Progress callback for download updates."""
         if progress_data['status'] == 'downloading':
+            if not self._interactive:
+                return
+            
+            # Throttle updates; yt-dlp reports progress many times per second
+            now = time.monotonic()
+            if now - self._last_progress_time < PROGRESS_UPDATE_INTERVAL:
+                return
+            self._last_progress_time = now
+            
             percent = progress_data.get('progress_percent', 0)
             downloaded = progress_data.get('downloaded_bytes', 0)
             total = progress_data.get('total_bytes', 0)
             speed = progress_data.get('speed', 0)
             
             if total:
-                downloaded_mb = downloaded / (1024 * 1024)
-                total_mb = total / (1024 * 1024)
-                print(f"\rDownloading: {percent:.1f}% ({downloaded_mb:.1f}/{total_mb:.1f} MB) "
-                      f"Speed: {speed or 'Unknown'} bytes/s", end='', flush=True)
+                line = _PROGRESS_LINE(percent, downloaded * _MB_PER_BYTE,
+                                      total * _MB_PER_BYTE, speed or 'Unknown')
+                with self._output_lock:
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
         
         elif progress_data['status'] == 'finished':
-            print(f"\nDownload completed: {progress_data['filename']}")
+            with self._output_lock:
+                print(f"\nDownload completed: {progress_data['filename']}")
     
     def download_single_url(self, 
                            url: str, 
@@ -122,97 +212,66 @@ class AudioDownloadCLI:
             
             print(f"🚀 Starting download: {url}")
             
-            # Create session
+            # Reuse the CLI session
             session_uuid = self.create_or_get_session()
             
             # Get user context
-            user_context = get_session(session_uuid)
+            user_context = self.user_context
             if not user_context:
                 print("Error: Could not get user context")
                 return False
             
             # Get job UUID for this URL
-            job_uuid = user_context.get_url_uuid(url)
+            with self._session_lock:
+                job_uuid = user_context.get_url_uuid(url)
             
-            # Create downloader
-            downloader = AudioDownloader(
-                output_dir=output_dir,
-                progress_callback=self.progress_callback
-            )
+            # Reuse the downloader for this output directory
+            downloader = self.get_downloader(output_dir)
             
-            # Validate URL
+            # Validate URL (cached by the downloader for repeated URLs)
             if not downloader.validate_url(url):
                 print(f"Error: Invalid or unsupported URL: {url}")
                 return False
             
             # Start job in session manager
-            if not self.session_manager.start_job(session_uuid):
+            with self._session_lock:
+                job_started = self.session_manager.start_job(session_uuid)
+            if not job_started:
                 print("Error: Maximum jobs per session exceeded")
                 return False
             
             try:
-                # Download with session integration and retry logic
-                max_retries = 3
-                retry_delay = 5  # seconds
+                # Network errors are retried inside the downloader
+                result = downloader.download_audio_with_session(
+                    url=url,
+                    session_uuid=session_uuid,
+                    job_uuid=job_uuid,
+                    progress_callback=self.progress_callback
+                )
                 
-                for attempt in range(max_retries):
-                    if attempt > 0:
-                        print(f"\n🔄 Retry attempt {attempt}/{max_retries - 1}...")
-                        time.sleep(retry_delay)
-                    
-                    result = downloader.download_audio_with_session(
-                        url=url,
-                        session_uuid=session_uuid,
-                        job_uuid=job_uuid,
-                        progress_callback=self.progress_callback
-                    )
+                if result.success:
+                    print(f"\n✅ Download successful!")
+                    print(f"   File: {result.output_path}")
+                    print(f"   Size: {result.file_size_bytes / (1024*1024):.1f} MB")
+                    print(f"   Duration: {result.duration_seconds:.0f} seconds" if result.duration_seconds else "   Duration: Unknown")
+                    print(f"   Title: {result.title}")
+                    if result.artist:
+                        print(f"   Artist: {result.artist}")
                     
-                    if result.success:
-                        print(f"\n✅ Download successful!")
-                        print(f"   File: {result.output_path}")
-                        print(f"   Size: {result.file_size_bytes / (1024*1024):.1f} MB")
-                        print(f"   Duration: {result.duration_seconds:.0f} seconds" if result.duration_seconds else "   Duration: Unknown")
-                        print(f"   Title: {result.title}")
-                        if result.artist:
-                            print(f"   Artist: {result.artist}")
-                        
-                        # Complete job in session manager
+                    # Complete job in session manager
+                    with self._session_lock:
                         self.session_manager.complete_job(session_uuid, result.file_size_bytes or 0)
-                        return True
-                    
-                    # Check if this is a retryable network error
-                    elif result.status == DownloadStatus.PENDING:
-                        print(f"\n⚠️  {result.error_message}")
-                        continue  # Retry
-                    
-                    # Check for network-related errors that should be retried
-                    elif any(network_error in result.error_message.lower() for network_error in [
-                        'network', 'connection', 'timeout', 'resolve', 'getaddrinfo', 
-                        'bytes read', 'more expected', 'incomplete read', 'partial download',
-                        'connection broken', 'download interrupted'
-                    ]):
-                        print(f"\n⚠️  Network issue detected: {result.error_message}")
-                        if attempt < max_retries - 1:
-                            print(f"🔄 Will retry in {retry_delay} seconds...")
-                        continue
-                    else:
-                        # Non-retryable error
-                        print(f"\n❌ Download failed: {result.error_message}")
-                        self.session_manager.fail_job(session_uuid)
-                        return False
+                    return True
                 
-                # All retries exhausted
-                print(f"\n❌ Download failed after {max_retries} attempts due to persistent network issues.")
-                print("💡 Suggestions:")
-                print("   • Check your internet connection")
-                print("   • Try again in a few minutes") 
-                print("   • Check if YouTube is accessible in your region")
-                self.session_manager.fail_job(session_uuid)
+                print(f"\n❌ Download failed: {result.error_message}")
+                with self._session_lock:
+                    self.session_manager.fail_job(session_uuid)
                 return False
                     
             except Exception as e:
                 print(f"\n❌ Download error: {e}")
-                self.session_manager.fail_job(session_uuid)
+                with self._session_lock:
+                    self.session_manager.fail_job(session_uuid)
                 return False
                 
         except Exception as e:
@@ -221,15 +280,20 @@ class AudioDownloadCLI:
     
     def download_multiple_urls(self, 
                               urls: List[str], 
-                              output_dir: Path) -> int:
+                              output_dir: Path,
+                              concurrency: int = DEFAULT_CONCURRENCY) -> int:
         """
         Download audio from multiple URLs.
         
         Downloads are always performed with best quality and MP3 format.
+        URLs are downloaded in parallel worker threads, since downloads are
+        network-bound.
         
         Args:
             urls: List of YouTube video URLs
             output_dir: Output directory for downloads
+            concurrency: Maximum number of parallel downloads (capped at the
+                session's job limit, since every worker shares one session)
             
         Returns:
             Number of successful downloads
@@ -237,41 +301,142 @@ class AudioDownloadCLI:
         successful_downloads = 0
         total_urls = len(urls)
         
-        print(f"Starting batch download of {total_urls} URLs...")
+        job_limit = self.session_manager.get_session_stats()['max_jobs_per_session']
+        if concurrency > job_limit:
+            print(f"Concurrency {concurrency} exceeds the per-session job limit; using {job_limit}")
+            concurrency = job_limit
+        
+        print(f"Starting batch download of {total_urls} URLs ({concurrency} at a time)...")
         print("-" * 50)
         
-        for i, url in enumerate(urls, 1):
-            print(f"\n[{i}/{total_urls}] Processing: {url}")
-            
-            if self.download_single_url(url, output_dir):
-                successful_downloads += 1
+        def download_indexed(index: int, url: str) -> bool:
+            with self._output_lock:
+                print(f"\n[{index}/{total_urls}] Processing: {url}")
+            return self.download_single_url(url, output_dir)
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {
+                executor.submit(download_indexed, i, url): url
+                for i, url in enumerate(urls, 1)
+            }
             
-            print("-" * 50)
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        successful_downloads += 1
+                except Exception as e:
+                    logger.error(f"Batch download failed for {futures[future]}: {e}")
+                
+                with self._output_lock:
+                    print("-" * 50)
         
         print(f"\nBatch download complete: {successful_downloads}/{total_urls} successful")
         return successful_downloads
     
     def show_session_info(self):
-        """Show current session information."""
-        if not self.session_uuid or not self.session_manager:
+        """
+        Show session information.
+        
+        Shows the CLI's own session if one was created in this process,
+        otherwise every active session known to the session manager.
+        """
+        if not self.session_manager:
             print("No active session")
             return
         
         try:
-            session_info = self.session_manager.get_session_info(self.session_uuid)
-            if session_info:
-                print(f"Session UUID: {session_info['session_uuid']}")
-                print(f"Created: {session_info['created_at']}")
-                print(f"Active: {session_info['is_active']}")
-                print(f"Total Jobs: {session_info['total_jobs']}")
-                print(f"Completed Jobs: {session_info['completed_jobs']}")
-                print(f"Failed Jobs: {session_info['failed_jobs']}")
-                print(f"Storage Used: {session_info['storage_used_bytes'] / (1024*1024):.1f} MB")
-            else:
-                print("Session not found")
+            if self.session_uuid:
+                session_info = self.session_manager.get_session_info(self.session_uuid)
+                if session_info:
+                    self._print_session_info(session_info)
+                else:
+                    print("Session not found")
+                return
+            
+            active_sessions = self.session_manager.get_active_sessions()
+            if not active_sessions:
+                print("No active session (sessions do not carry over between runs)")
+                return
+            
+            for i, session_info in enumerate(active_sessions):
+                if i:
+                    print("-" * 50)
+                self._print_session_info(session_info)
         except Exception as e:
             print(f"Error getting session info: {e}")
     
+    @staticmethod
+    def _print_session_info(session_info: dict):
+        """Print one session info dictionary."""
+        print(f"Session UUID: {session_info['session_uuid']}")
+        print(f"Created: {session_info['created_at']}")
+        print(f"Active: {session_info['is_active']}")
+        print(f"Total Jobs: {session_info['total_jobs']}")
+        print(f"Completed Jobs: {session_info['completed_jobs']}")
+        print(f"Failed Jobs: {session_info['failed_jobs']}")
+        print(f"Storage Used: {session_info['storage_used_bytes'] / (1024*1024):.1f} MB")
+    
+    
+    def download_url_stream(self, lines: Iterable[str], output_dir: Path) -> int:
+        """
+        Download audio for URLs as they are read from a stream (e.g. stdin).
+        
+        Each URL is downloaded as soon as its line arrives, reusing the
+        session and downloader; blank lines and repeated URLs are skipped.
+        
+        Args:
+            lines: Iterable of lines, one URL per line
+            output_dir: Output directory for downloads
+            
+        Returns:
+            Number of successful downloads
+        """
+        seen = set()
+        successful_downloads = 0
+        
+        for line in lines:
+            url = line.strip()
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            
+            print(f"\n[{len(seen)}] Processing: {url}")
+            if self.download_single_url(url, output_dir):
+                successful_downloads += 1
+            print("-" * 50)
+        
+        print(f"\nStream download complete: {successful_downloads}/{len(seen)} successful")
+        return successful_downloads
+    
+    def read_urls_file(self, urls_file: str) -> List[str]:
+        """
+        Read URLs from a file, one per line, skipping blanks and duplicates.
+        
+        Args:
+            urls_file: Path to the URLs file
+            
+        Returns:
+            Unique URLs in file order
+        """
+        seen = set()
+        urls = []
+        duplicates = 0
+        
+        with open(urls_file, 'r') as f:
+            for line in f:
+                url = line.strip()
+                if not url:
+                    continue
+                if url in seen:
+                    duplicates += 1
+                    continue
+                seen.add(url)
+                urls.append(url)
+        
+        if duplicates:
+            print(f"Skipped {duplicates} duplicate URL(s) in {urls_file}")
+        
+        return urls
     
     def run(self, args):
         """Run the CLI with parsed arguments."""
@@ -279,9 +444,12 @@ class AudioDownloadCLI:
             # Setup logging
             self.setup_logging(args.verbose)
             
-            # Ensure output directory exists
-            output_dir = Path(args.output_dir)
-            output_dir.mkdir(parents=True, exist_ok=True)
+            # Resolve and create the output directory once for every download
+            output_dir = self.ensure_output_dir(Path(args.output_dir))
+            
+            if args.url or args.urls_file or args.stdin:
+                # One session for all downloads in this invocation
+                self.create_or_get_session(args.session_uuid)
             
             if args.url:
                 # Single URL download
@@ -290,13 +458,12 @@ class AudioDownloadCLI:
                     output_dir=output_dir,
                     custom_filename=args.filename
                 )
-                sys.exit(0 if success else 1)
+                exit_code = 0 if success else 1
             
             elif args.urls_file:
                 # Multiple URLs from file
                 try:
-                    with open(args.urls_file, 'r') as f:
-                        urls = [line.strip() for line in f if line.strip()]
+                    urls = self.read_urls_file(args.urls_file)
                     
                     if not urls:
                         print("No URLs found in file")
@@ -304,22 +471,34 @@ class AudioDownloadCLI:
                     
                     successful = self.download_multiple_urls(
                         urls=urls,
-                        output_dir=output_dir
+                        output_dir=output_dir,
+                        concurrency=args.concurrency
                     )
-                    sys.exit(0 if successful > 0 else 1)
+                    exit_code = 0 if successful > 0 else 1
                     
                 except FileNotFoundError:
                     print(f"Error: File not found: {args.urls_file}")
                     sys.exit(1)
             
+            elif args.stdin:
+                # URLs piped in on stdin, downloaded in this one process
+                successful = self.download_url_stream(sys.stdin, output_dir)
+                exit_code = 0 if successful > 0 else 1
+            
             elif args.session_info:
-                # Show session information
-                self.create_or_get_session()
-                self.show_session_info()
+                # Nothing downloaded; only sessions created in this process exist
+                exit_code = 0
             
             else:
                 print("No action specified. Use --help for usage information.")
                 sys.exit(1)
+            
+            if args.session_info:
+                # Sessions are kept in memory, so report the one this run used
+                # rather than creating an empty one just to display it
+                self.show_session_info()
+            
+            sys.exit(exit_code)
                 
         except KeyboardInterrupt:
             print("\nDownload cancelled by user")
@@ -332,6 +511,14 @@ class AudioDownloadCLI:
             sys.exit(1)
 
 
+def _session_uuid_arg(value: str) -> str:
+    """Validate a --session-uuid value; it becomes a directory name."""
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid session UUID: {value}")
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="YouTube Audio Downloader")
@@ -340,30 +527,36 @@ def main():
     url_group = parser.add_mutually_exclusive_group()
     url_group.add_argument("--url", help="Single YouTube video URL to download")
     url_group.add_argument("--urls-file", help="File containing YouTube URLs (one per line)")
+    url_group.add_argument("--stdin", action="store_true", help="Read YouTube URLs from standard input (one per line)")
     
     # Other options
     parser.add_argument("--output-dir", default="./django/my_downloader/media/downloads", help="Output directory for downloads")
     parser.add_argument("--filename", help="Custom filename template")
-    parser.add_argument("--session-info", action="store_true", help="Show current session information")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Number of URLs to download in parallel with --urls-file (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--session-info", action="store_true",
+                        help="Show this run's session after downloading (sessions are kept in memory "
+                             "and do not carry over between runs)")
+    parser.add_argument("--session-uuid", type=_session_uuid_arg,
+                        help="Session UUID to download into (default: a new session); reuse it to "
+                             "keep several runs' downloads in one session directory")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     
     args = parser.parse_args()
     
     # Validate that either a URL option or --session-info is provided
-    if not (args.url or args.urls_file or args.session_info):
-        parser.error("At least one of --url, --urls-file, or --session-info must be provided")
+    if not (args.url or args.urls_file or args.stdin or args.session_info):
+        parser.error("At least one of --url, --urls-file, --stdin, or --session-info must be provided")
     
     # Set up logging first
-    setup_logging()
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
-    
-    # Initialize download monitor
-    monitor = get_global_monitor()
+    setup_logging(debug_mode=args.verbose)
     
     try:
         # Check network connectivity first (only for download operations)
-        if args.url or args.urls_file:
+        if args.url or args.urls_file or args.stdin:
+            from src.common.download_monitor import get_global_monitor
+            
+            monitor = get_global_monitor()
             network_result = monitor.check_network_connectivity()
             if not network_result.is_online:
                 print(f"❌ Network Error: {network_result.error_message}")
@@ -1,30 +1,50 @@
 #!/usr/bin/env python3
 import requests
 import json
+from requests.adapters import HTTPAdapter
 
-# Test the API directly
-try:
-    response = requests.post(
-        'http://localhost:8000/api/auto-download/',
-        json={'url': 'https://www.youtube.com/watch?v=XNNjYas8Xo8'},
-        timeout=30
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    print(f"Response Headers: {dict(response.headers)}")
-    print(f"Response Text: {response.text}")
-    
-    if response.status_code == 200:
-        data = response.json()
-        print(f"Success: {data.get('success')}")
-        if data.get('success'):
-            print(f"Download URL: {data.get('download_url')}")
+API_URL = 'http://localhost:8000/api/auto-download/'
+
+# URLs to send to the API
+TEST_URLS = [
+    'https://www.youtube.com/watch?v=XNNjYas8Xo8',
+]
+
+# Shared session so repeated requests reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def check_url(url):
+    """Test the API directly with a single URL."""
+    try:
+        response = _SESSION.post(
+            API_URL,
+            json={'url': url},
+            timeout=30
+        )
+
+        print(f"Status Code: {response.status_code}")
+        print(f"Response Headers: {dict(response.headers)}")
+        print(f"Response Text: {response.text}")
+
+        if response.status_code == 200:
+            data = response.json()
+            print(f"Success: {data.get('success')}")
+            if data.get('success'):
+                print(f"Download URL: {data.get('download_url')}")
+            else:
+                print(f"Error: {data.get('error')}")
         else:
-            print(f"Error: {data.get('error')}")
-    else:
-        print(f"HTTP Error: {response.status_code}")
-        
-except Exception as e:
-    print(f"Exception: {e}")
-    import traceback
-    traceback.print_exc()
+            print(f"HTTP Error: {response.status_code}")
+
+    except Exception as e:
+        print(f"Exception: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == '__main__':
+    for url in TEST_URLS:
+        check_url(url)
@@ -3,16 +3,18 @@
 Test script for Django integration with audio downloader.
 """
 
+import contextlib
+import io
 import os
 import sys
 import subprocess
 from pathlib import Path
 
 def run_command(cmd, cwd=None):
-    """Run a command and return the result."""
-    print(f"Running: {cmd}")
+    """Run a command (argv list, no shell) and return the result."""
+    print(f"Running: {' '.join(cmd)}")
     try:
-        result = subprocess.run(cmd, shell=True, cwd=cwd, capture_output=True, text=True)
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
         if result.returncode != 0:
             print(f"Error: {result.stderr}")
             return False
@@ -22,13 +24,28 @@ def run_command(cmd, cwd=None):
         print(f"Exception: {e}")
         return False
 
+def run_management_command(name, *args):
+    """Run a Django management command in this process and return the result."""
+    from django.core.management import call_command
+    
+    print(f"Running: manage.py {name}")
+    stdout, stderr = io.StringIO(), io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            call_command(name, *args)
+    except BaseException as e:  # call_command may raise SystemExit
+        print(f"Error: {stderr.getvalue()}{e}")
+        return False
+    print(f"Success: {stdout.getvalue()}")
+    return True
+
 def main():
     """Test the Django integration."""
     print("🧪 Testing Django Integration with Audio Downloader")
     print("=" * 50)
     
     # Change to Django directory
-    django_dir = Path(__file__).parent / "django" / "my_downloader"
+    django_dir = Path(__file__).resolve().parent / "django" / "my_downloader"
     
     if not django_dir.exists():
         print("❌ Django directory not found!")
@@ -36,16 +53,28 @@ def main():
     
     print(f"📁 Working directory: {django_dir}")
     
+    # Load Django once in this interpreter, as manage.py would
+    os.chdir(django_dir)
+    sys.path.insert(0, str(django_dir))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_downloader.settings')
+    
     # Test 1: Check if Django can start
     print("\n1️⃣ Testing Django startup...")
-    if not run_command("python manage.py check", cwd=django_dir):
+    try:
+        import django
+        django.setup()
+    except Exception as e:
+        print(f"Error: {e}")
+        print("❌ Django check failed!")
+        return False
+    if not run_management_command("check"):
         print("❌ Django check failed!")
         return False
     print("✅ Django check passed!")
     
     # Test 2: Test database connection
     print("\n2️⃣ Testing database connection...")
-    if not run_command("python manage.py showmigrations", cwd=django_dir):
+    if not run_management_command("showmigrations"):
         print("❌ Database connection failed!")
         print("💡 Make sure PostgreSQL is running and configured in .env file")
         return False
@@ -53,28 +82,21 @@ def main():
     
     # Test 3: Test audio downloader import
     print("\n3️⃣ Testing audio downloader import...")
-    test_import_cmd = """
-python -c "
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path.cwd().parent.parent / 'src'))
-try:
-    from yt_audio_dl.audio_core import AudioDownloader
-    from common.session_manager import get_session_manager
-    print('✅ Audio downloader imports successful!')
-except ImportError as e:
-    print(f'❌ Import failed: {e}')
-    sys.exit(1)
-"
-"""
-    if not run_command(test_import_cmd, cwd=django_dir):
+    sys.path.insert(0, str(django_dir.parent.parent / 'src'))
+    try:
+        from yt_audio_dl.audio_core import AudioDownloader
+        from common.session_manager import get_session_manager
+        print('✅ Audio downloader imports successful!')
+    except ImportError as e:
+        print(f'❌ Import failed: {e}')
         print("❌ Audio downloader import failed!")
         return False
     
-    # Test 4: Test management command
+    # Test 4: Test management command (separate process, as a user would run it)
     print("\n4️⃣ Testing management command...")
     test_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"  # Rick Roll for testing
-    if not run_command(f"python manage.py test_download '{test_url}' --output-dir ./test_output", cwd=django_dir):
+    cmd = [sys.executable, "manage.py", "test_download", test_url, "--output-dir", "./test_output"]
+    if not run_command(cmd, cwd=django_dir):
         print("❌ Management command test failed!")
         print("💡 This might be due to network issues or yt-dlp problems")
         return False
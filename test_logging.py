@@ -3,19 +3,17 @@
 Test script to demonstrate the enhanced logging functionality.
 """
 
-import sys
-from pathlib import Path
-
 # Add project to path for testing
-project_root = Path(__file__).resolve().parent
-sys.path.insert(0, str(project_root))
+import tests._bootstrap  # noqa: F401
 
 from src.common import (
     configure_development_logging, 
     get_logger, 
     get_performance_logger,
     LogPerformance,
-    log_performance_metric
+    log_performance_metric,
+    start_queue_logging,
+    stop_queue_logging
 )
 import time
 
@@ -25,34 +23,40 @@ def test_enhanced_logging():
     # Setup development logging
     configure_development_logging()
     
-    # Test different loggers
-    app_logger = get_logger('audio_core')
-    api_logger = get_logger('api.main')
-    session_logger = get_logger('session_manager')
-    perf_logger = get_performance_logger()
-    
-    # Test basic logging
-    app_logger.info("Audio core module initialized")
-    app_logger.debug("Debug message from audio core")
-    
-    api_logger.info("API endpoint called")
-    api_logger.warning("API warning message")
-    
-    session_logger.info("Session created successfully")
-    session_logger.debug("Session debug information")
-    
-    # Test performance logging
-    log_performance_metric("test_operation", 1.23, bytes_processed=1024, success=True)
-    
-    # Test performance context manager
-    with LogPerformance("context_operation", component="test") as perf:
-        time.sleep(0.1)  # Simulate work
-    
-    # Test error logging
+    # File writes happen on listener threads; the calls below return at once
+    listeners = start_queue_logging()
     try:
-        raise ValueError("Test error for logging")
-    except Exception as e:
-        app_logger.error(f"Caught exception: {e}", exc_info=True)
+        # Test different loggers
+        app_logger = get_logger('audio_core')
+        api_logger = get_logger('api.main')
+        session_logger = get_logger('session_manager')
+        perf_logger = get_performance_logger()
+        
+        # Test basic logging
+        app_logger.info("Audio core module initialized")
+        app_logger.debug("Debug message from audio core")
+        
+        api_logger.info("API endpoint called")
+        api_logger.warning("API warning message")
+        
+        session_logger.info("Session created successfully")
+        session_logger.debug("Session debug information")
+        
+        # Test performance logging
+        log_performance_metric("test_operation", 1.23, bytes_processed=1024, success=True)
+        
+        # Test performance context manager
+        with LogPerformance("context_operation", component="test") as perf:
+            time.sleep(0.1)  # Simulate work
+        
+        # Test error logging
+        try:
+            raise ValueError("Test error for logging")
+        except Exception as e:
+            app_logger.error(f"Caught exception: {e}", exc_info=True)
+    finally:
+        # Flush queued records to the log files
+        stop_queue_logging(listeners)
     
     print("✅ Enhanced logging test completed!")
     print("📁 Check the logs directory for organized log files:")
@@ -0,0 +1,19 @@
+"""
+Import-path bootstrap shared by the test suite and test scripts.
+
+Computes the project paths once and makes `src` importable. Uses
+os.path.abspath rather than Path.resolve() so no filesystem calls are
+made to resolve symlinks.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = TEST_DIR.parent
+SRC_DIR = PROJECT_ROOT / "src"
+
+for _path in (str(PROJECT_ROOT), str(SRC_DIR)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
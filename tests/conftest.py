@@ -6,28 +6,26 @@ and utilities used across all test modules.
 """
 
 import pytest
+import pytest_asyncio
 import tempfile
 import shutil
 from pathlib import Path
 from unittest.mock import Mock, MagicMock
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-# Add src directory to path for imports
-import sys
-from pathlib import Path as PathLib
-TEST_DIR = PathLib(__file__).resolve().parent
-PROJECT_ROOT = TEST_DIR.parent
-sys.path.insert(0, str(PROJECT_ROOT / "src"))
+# Add src directory to path for imports (once per session)
+import tests._bootstrap  # noqa: F401
 
-from src.common.session_manager import SessionManager, SessionInfo
-from src.common.user_context import UserContext
-from src.yt_audio_dl.audio_core import AudioDownloader
+# Project classes are imported inside the fixtures that need them, so
+# collecting tests that use none of them does not load yt-dlp
 
 
 @pytest.fixture
-def temp_dir():
+def temp_dir(request):
     """Create a temporary directory for test files."""
-    temp_path = Path(tempfile.mkdtemp())
+    # Prefix with the xdist worker so parallel runs are easy to tell apart
+    worker_id = getattr(request.config, 'workerinput', {}).get('workerid', 'main')
+    temp_path = Path(tempfile.mkdtemp(prefix=f"pytest-{worker_id}-"))
     yield temp_path
     shutil.rmtree(temp_path, ignore_errors=True)
 
@@ -43,6 +41,8 @@ def temp_download_dir(temp_dir):
 @pytest.fixture
 def mock_session_manager():
     """Create a mock session manager for testing."""
+    from src.common.session_manager import SessionManager
+    
     mock_manager = Mock(spec=SessionManager)
     mock_manager._sessions = {}
     mock_manager._lock = Mock()
@@ -72,6 +72,8 @@ def mock_session_manager():
 @pytest.fixture
 def mock_user_context():
     """Create a mock user context for testing."""
+    from src.common.user_context import UserContext
+    
     mock_context = Mock(spec=UserContext)
     mock_context.session_uuid = "test-session-uuid"
     mock_context._job_sessions = {}
@@ -100,6 +102,8 @@ def mock_user_context():
 @pytest.fixture
 def mock_audio_downloader():
     """Create a mock audio downloader for testing."""
+    from src.yt_audio_dl.audio_core import AudioDownloader
+    
     mock_downloader = Mock(spec=AudioDownloader)
     
     # Configure mock methods
@@ -194,7 +198,7 @@ def mock_progress_callback():
     return callback
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_urls():
     """Provide test YouTube URLs for testing."""
     return {
@@ -235,22 +239,44 @@ def mock_logger():
     return mock_logger
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def disable_logging():
-    """Disable logging during tests to reduce noise."""
+    """Disable logging during tests to reduce noise (once per session)."""
     import logging
     logging.disable(logging.CRITICAL)
     yield
     logging.disable(logging.NOTSET)
 
 
-@pytest.fixture
-def async_client():
+@pytest.fixture(autouse=True)
+def enable_logging_for_marked_tests(request, disable_logging):
+    """Re-enable logging for tests marked with @pytest.mark.enable_logging."""
+    if request.node.get_closest_marker("enable_logging") is None:
+        yield
+        return
+    
+    import logging
+    logging.disable(logging.NOTSET)
+    yield
+    logging.disable(logging.CRITICAL)
+
+
+@pytest.fixture(scope="session")
+def asgi_transport():
+    """Create one ASGI transport to the FastAPI app for the whole test session."""
+    from httpx import ASGITransport
+    from src.api.main import app
+    
+    return ASGITransport(app=app)
+
+
+@pytest_asyncio.fixture
+async def async_client(asgi_transport):
     """Create an async HTTP client for testing FastAPI endpoints."""
     from httpx import AsyncClient
-    from src.api.main import app
     
-    return AsyncClient(app=app, base_url="http://test")
+    async with AsyncClient(transport=asgi_transport, base_url="http://test") as client:
+        yield client
 
 
 # Test configuration
@@ -271,19 +297,26 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "requires_network: mark test as requiring network access"
     )
+    config.addinivalue_line(
+        "markers", "enable_logging: keep logging enabled for this test"
+    )
 
 
 # Test utilities
 class TestUtils:
     """Utility functions for testing."""
     
-    @staticmethod
-    def create_temp_file(content: str = "test content", suffix: str = ".txt") -> Path:
+    # Temp files created by create_temp_file, removed by the test_utils fixture
+    _created_files: List[Path] = []
+    
+    @classmethod
+    def create_temp_file(cls, content: str = "test content", suffix: str = ".txt") -> Path:
         """Create a temporary file with content."""
-        import tempfile
-        temp_file = Path(tempfile.mktemp(suffix=suffix))
-        temp_file.write_text(content)
-        return temp_file
+        with tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False) as temp_file:
+            temp_file.write(content)
+        path = Path(temp_file.name)
+        cls._created_files.append(path)
+        return path
     
     @staticmethod
     def assert_path_exists(path: Path, should_exist: bool = True):
@@ -302,7 +335,11 @@ class TestUtils:
         return mock_response
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_utils():
     """Provide test utilities."""
-    return TestUtils
+    yield TestUtils
+    
+    # Remove temp files created through the utilities
+    while TestUtils._created_files:
+        TestUtils._created_files.pop().unlink(missing_ok=True)
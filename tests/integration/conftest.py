@@ -0,0 +1,91 @@
+"""
+Shared fixtures for integration tests.
+
+API clients are created once per test session so the FastAPI app starts
+(and runs its lifespan) only once for all integration tests.
+"""
+
+import pytest
+import pytest_asyncio
+
+
+# Metadata returned by the mocked yt-dlp unless a test overrides it
+DEFAULT_YTDL_INFO = {
+    'id': 'test',
+    'title': 'Test Video',
+    'uploader': 'Test Channel',
+    'duration': 120
+}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create a test client for the API, shared by the whole session."""
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client(asgi_transport):
+    """Create an in-process async test client for the API, shared by the whole session."""
+    from httpx import AsyncClient
+    
+    async with AsyncClient(transport=asgi_transport, base_url="http://test") as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def api_session_manager():
+    """The SessionManager instance the API routes resolve, for direct state assertions."""
+    from src.common import get_session_manager
+    return get_session_manager()
+
+
+@pytest.fixture(scope="session")
+def _shared_session_manager():
+    from src.common.session_manager import SessionManager
+    return SessionManager()
+
+
+@pytest.fixture
+def session_manager(_shared_session_manager):
+    """Provide a real SessionManager with no sessions left over from earlier tests."""
+    with _shared_session_manager._lock:
+        _shared_session_manager._sessions.clear()
+    return _shared_session_manager
+
+
+@pytest.fixture(scope="session")
+def completed_download_result():
+    """Shared successful AudioDownloadResult (frozen; derive variants with dataclasses.replace)."""
+    from pathlib import Path
+    from src.yt_audio_dl.audio_core import AudioDownloadResult, DownloadStatus
+    
+    return AudioDownloadResult(
+        success=True,
+        status=DownloadStatus.COMPLETED,
+        output_path=Path("/test/output.mp3"),
+        file_size_bytes=1024,
+        duration_seconds=120,
+        title="Test Video",
+        artist="Test Channel",
+        format="mp3"
+    )
+
+
+@pytest.fixture
+def mock_ytdl(mocker):
+    """Patch yt_dlp.YoutubeDL in audio_core and return the entered instance.
+    
+    The instance returns DEFAULT_YTDL_INFO from extract_info(); tests only
+    need to override extract_info.return_value for different metadata.
+    The patch is undone by pytest-mock at teardown.
+    """
+    mock_ydl_class = mocker.patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL')
+    mock_ydl_instance = mocker.Mock()
+    mock_ydl_instance.extract_info.return_value = dict(DEFAULT_YTDL_INFO)
+    mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+    return mock_ydl_instance
@@ -6,45 +6,28 @@ and audio downloader components.
 """
 
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
+from dataclasses import replace
 from unittest.mock import patch, Mock
 import json
 import asyncio
 
-from fastapi.testclient import TestClient
-from httpx import AsyncClient
 
-from src.api.main import app
-from src.common.session_manager import SessionManager
-from src.yt_audio_dl.audio_core import AudioDownloadResult, DownloadStatus
+# Job payload shared by the happy-path tests (read-only; do not mutate)
+DEFAULT_JOB_DATA = {
+    "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "media_type": "audio",
+    "quality": "bestaudio",
+    "output_format": "mp3"
+}
 
 
 class TestAPIIntegration:
     """Integration tests for API endpoints."""
     
     @pytest.fixture
-    def temp_download_dir(self):
-        """Create a temporary download directory for API tests."""
-        temp_path = Path(tempfile.mkdtemp())
-        yield temp_path
-        shutil.rmtree(temp_path, ignore_errors=True)
-    
-    @pytest.fixture
-    def client(self):
-        """Create a test client for the API."""
-        return TestClient(app)
-    
-    @pytest.fixture
-    def async_client(self):
-        """Create an async test client for the API."""
-        return AsyncClient(base_url="http://test")
-    
-    @pytest.fixture
-    def session_manager(self):
-        """Create a real SessionManager for API tests."""
-        return SessionManager()
+    def temp_download_dir(self, tmp_path):
+        """Provide a temporary download directory for API tests (pytest-managed)."""
+        return tmp_path
     
     @pytest.mark.integration
     def test_health_endpoint_integration(self, client):
@@ -76,32 +59,34 @@ class TestAPIIntegration:
         assert response.status_code == 200
     
     @pytest.mark.integration
-    def test_session_management_integration(self, client):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_session_management_integration(self, async_client):
         """Test complete session management workflow."""
         # Create session
-        create_response = client.post("/sessions")
+        create_response = await async_client.post("/sessions")
         assert create_response.status_code == 201
         session_data = create_response.json()
         session_uuid = session_data["session_uuid"]
         
-        # Get session info
-        get_response = client.get(f"/api/sessions/{session_uuid}")
+        # Get session info and all sessions (independent requests)
+        get_response, list_response = await asyncio.gather(
+            async_client.get(f"/api/sessions/{session_uuid}"),
+            async_client.get("/sessions")
+        )
         assert get_response.status_code == 200
         assert get_response.json()["session_uuid"] == session_uuid
         
-        # Get all sessions
-        list_response = client.get("/sessions")
         assert list_response.status_code == 200
         sessions = list_response.json()
         assert len(sessions) >= 1
         assert any(s["session_uuid"] == session_uuid for s in sessions)
         
         # Delete session
-        delete_response = client.delete(f"/api/sessions/{session_uuid}")
+        delete_response = await async_client.delete(f"/api/sessions/{session_uuid}")
         assert delete_response.status_code == 200
         
         # Verify session is deleted
-        get_deleted_response = client.get(f"/api/sessions/{session_uuid}")
+        get_deleted_response = await async_client.get(f"/api/sessions/{session_uuid}")
         assert get_deleted_response.status_code == 404
     
     @pytest.mark.integration
@@ -112,55 +97,32 @@ class TestAPIIntegration:
         session_uuid = session_response.json()["session_uuid"]
         
         # Create job
-        job_data = {
-            "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "media_type": "audio",
-            "quality": "bestaudio",
-            "output_format": "mp3"
-        }
-        
-        response = client.post(f"/api/sessions/{session_uuid}/jobs", json=job_data)
+        response = client.post(f"/api/sessions/{session_uuid}/jobs", json=DEFAULT_JOB_DATA)
         assert response.status_code == 201
         
         job_response = response.json()
         assert "job_uuid" in job_response
         assert "job_id" in job_response
         assert job_response["session_uuid"] == session_uuid
-        assert job_response["job_url"] == job_data["url"]
-        assert job_response["media_type"] == job_data["media_type"]
+        assert job_response["job_url"] == DEFAULT_JOB_DATA["url"]
+        assert job_response["media_type"] == DEFAULT_JOB_DATA["media_type"]
         assert job_response["status"] == "pending"
     
     @pytest.mark.integration
-    def test_job_processing_integration(self, client, temp_download_dir):
+    def test_job_processing_integration(self, client, temp_download_dir, completed_download_result):
         """Test job processing integration with audio downloader."""
         # Create session
         session_response = client.post("/sessions")
         session_uuid = session_response.json()["session_uuid"]
         
         # Create job
-        job_data = {
-            "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "media_type": "audio",
-            "quality": "bestaudio",
-            "output_format": "mp3"
-        }
-        
-        job_response = client.post(f"/api/sessions/{session_uuid}/jobs", json=job_data)
+        job_response = client.post(f"/api/sessions/{session_uuid}/jobs", json=DEFAULT_JOB_DATA)
         job_uuid = job_response.json()["job_uuid"]
         
         # Mock audio downloader to avoid real download
         with patch('src.api.jobs.AudioDownloader') as mock_downloader_class:
             mock_downloader = Mock()
-            mock_result = AudioDownloadResult(
-                success=True,
-                status=DownloadStatus.COMPLETED,
-                output_path=temp_download_dir / "test.mp3",
-                file_size_bytes=1024,
-                duration_seconds=120,
-                title="Test Video",
-                artist="Test Channel",
-                format="mp3"
-            )
+            mock_result = replace(completed_download_result, output_path=temp_download_dir / "test.mp3")
             mock_downloader.download_audio_with_session.return_value = mock_result
             mock_downloader_class.return_value = mock_downloader
             
@@ -176,20 +138,13 @@ class TestAPIIntegration:
             assert job_status["status"] in ["pending", "running", "completed"]
     
     @pytest.mark.integration
-    def test_job_progress_tracking_integration(self, client):
+    def test_job_progress_tracking_integration(self, client, completed_download_result):
         """Test job progress tracking through API."""
         # Create session and job
         session_response = client.post("/sessions")
         session_uuid = session_response.json()["session_uuid"]
         
-        job_data = {
-            "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "media_type": "audio",
-            "quality": "bestaudio",
-            "output_format": "mp3"
-        }
-        
-        job_response = client.post(f"/api/sessions/{session_uuid}/jobs", json=job_data)
+        job_response = client.post(f"/api/sessions/{session_uuid}/jobs", json=DEFAULT_JOB_DATA)
         job_uuid = job_response.json()["job_uuid"]
         
         # Mock progress tracking
@@ -205,17 +160,7 @@ class TestAPIIntegration:
             mock_downloader.progress_callback = mock_progress_callback
             
             # Mock successful download
-            mock_result = AudioDownloadResult(
-                success=True,
-                status=DownloadStatus.COMPLETED,
-                output_path=Path("/test/output.mp3"),
-                file_size_bytes=1024,
-                duration_seconds=120,
-                title="Test Video",
-                artist="Test Channel",
-                format="mp3"
-            )
-            mock_downloader.download_audio_with_session.return_value = mock_result
+            mock_downloader.download_audio_with_session.return_value = completed_download_result
             mock_downloader_class.return_value = mock_downloader
             
             # Start job
@@ -250,46 +195,55 @@ class TestAPIIntegration:
         assert response.status_code in [201, 422]
     
     @pytest.mark.integration
-    def test_concurrent_sessions_integration(self, client):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_concurrent_sessions_integration(self, async_client):
         """Test multiple concurrent sessions through API."""
         # Create multiple sessions
+        responses = await asyncio.gather(*(async_client.post("/sessions") for _ in range(3)))
         sessions = []
-        for i in range(3):
-            response = client.post("/sessions")
+        for response in responses:
             assert response.status_code == 201
             sessions.append(response.json()["session_uuid"])
         
         # Create jobs in each session
-        for i, session_uuid in enumerate(sessions):
-            job_data = {
+        job_responses = await asyncio.gather(*(
+            async_client.post(f"/api/sessions/{session_uuid}/jobs", json={
                 "url": f"https://www.youtube.com/watch?v=test{i}",
                 "media_type": "audio",
                 "quality": "bestaudio",
                 "output_format": "mp3"
-            }
-            
-            response = client.post(f"/api/sessions/{session_uuid}/jobs", json=job_data)
+            })
+            for i, session_uuid in enumerate(sessions)
+        ))
+        job_uuids = []
+        for response in job_responses:
             assert response.status_code == 201
-            job_uuid = response.json()["job_uuid"]
-            
-            # Verify job was created
-            job_response = client.get(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}")
+            job_uuids.append(response.json()["job_uuid"])
+        
+        # Verify jobs were created
+        status_responses = await asyncio.gather(*(
+            async_client.get(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}")
+            for session_uuid, job_uuid in zip(sessions, job_uuids)
+        ))
+        for session_uuid, job_response in zip(sessions, status_responses):
             assert job_response.status_code == 200
             assert job_response.json()["session_uuid"] == session_uuid
         
         # Verify all sessions exist
-        list_response = client.get("/sessions")
+        list_response = await async_client.get("/sessions")
         assert list_response.status_code == 200
         all_sessions = list_response.json()
         assert len(all_sessions) >= 3
         
         # Clean up sessions
-        for session_uuid in sessions:
-            delete_response = client.delete(f"/api/sessions/{session_uuid}")
+        delete_responses = await asyncio.gather(*(
+            async_client.delete(f"/api/sessions/{session_uuid}") for session_uuid in sessions
+        ))
+        for delete_response in delete_responses:
             assert delete_response.status_code == 200
     
     @pytest.mark.integration
-    def test_session_cleanup_integration(self, client):
+    def test_session_cleanup_integration(self, client, api_session_manager):
         """Test session cleanup and expiration."""
         # Create session
         session_response = client.post("/sessions")
@@ -305,6 +259,9 @@ class TestAPIIntegration:
         assert stats["total_sessions"] >= 1
         assert stats["active_sessions"] >= 1
         
+        # The endpoint reports the manager the API uses
+        assert api_session_manager.get_session(session_uuid) is not None
+        
         # Delete session
         delete_response = client.delete(f"/api/sessions/{session_uuid}")
         assert delete_response.status_code == 200
@@ -312,9 +269,10 @@ class TestAPIIntegration:
         # Verify session is cleaned up
         get_response = client.get(f"/api/sessions/{session_uuid}")
         assert get_response.status_code == 404
+        assert api_session_manager.get_session(session_uuid) is None
     
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_async_api_integration(self, async_client):
         """Test async API functionality."""
         # Test async health endpoint
@@ -332,48 +290,37 @@ class TestAPIIntegration:
         assert "session_uuid" in session_data
     
     @pytest.mark.integration
-    def test_api_with_real_audio_downloader(self, client, temp_download_dir):
+    def test_api_with_real_audio_downloader(self, client, temp_download_dir, mock_ytdl, mocker):
         """Test API with real AudioDownloader (without actual download)."""
         # Create session
         session_response = client.post("/sessions")
         session_uuid = session_response.json()["session_uuid"]
         
         # Create job
-        job_data = {
-            "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "media_type": "audio",
-            "quality": "bestaudio",
-            "output_format": "mp3"
-        }
-        
-        job_response = client.post(f"/api/sessions/{session_uuid}/jobs", json=job_data)
+        job_response = client.post(f"/api/sessions/{session_uuid}/jobs", json=DEFAULT_JOB_DATA)
         job_uuid = job_response.json()["job_uuid"]
         
         # Mock yt-dlp to avoid real download
-        with patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL') as mock_ydl_class:
-            mock_ydl_instance = Mock()
-            mock_ydl_instance.extract_info.return_value = {
-                'id': 'dQw4w9WgXcQ',
-                'title': 'Test Video',
-                'uploader': 'Test Channel',
-                'duration': 120
-            }
-            mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
-            
-            # Create mock output file
-            output_file = temp_download_dir / "Test Video.mp3"
-            output_file.write_text("fake audio content")
-            
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
-                # Start job processing
-                start_response = client.post(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}/start")
-                assert start_response.status_code == 200
-                
-                # Check job status
-                status_response = client.get(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}")
-                assert status_response.status_code == 200
-                
-                job_status = status_response.json()
-                assert job_status["status"] in ["pending", "running", "completed"]
+        mock_ytdl.extract_info.return_value = {
+            'id': 'dQw4w9WgXcQ',
+            'title': 'Test Video',
+            'uploader': 'Test Channel',
+            'duration': 120
+        }
+        
+        # Create mock output file
+        output_file = temp_download_dir / "Test Video.mp3"
+        output_file.write_text("fake audio content")
+        mocker.patch('src.yt_audio_dl.audio_core.AudioDownloader._resolve_output_file',
+                     return_value=output_file)
+        
+        # Start job processing
+        start_response = client.post(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}/start")
+        assert start_response.status_code == 200
+        
+        # Check job status
+        status_response = client.get(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}")
+        assert status_response.status_code == 200
+        
+        job_status = status_response.json()
+        assert job_status["status"] in ["pending", "running", "completed"]
@@ -5,11 +5,10 @@ This module tests the integration between AudioDownloader, UserContext,
 and other components with real file system operations.
 """
 
+import os
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 import time
 
 from src.yt_audio_dl.audio_core import AudioDownloader, AudioDownloadResult, DownloadStatus
@@ -21,11 +20,9 @@ class TestAudioDownloaderIntegration:
     """Integration tests for AudioDownloader with real components."""
     
     @pytest.fixture
-    def temp_download_dir(self):
-        """Create a temporary download directory for integration tests."""
-        temp_path = Path(tempfile.mkdtemp())
-        yield temp_path
-        shutil.rmtree(temp_path, ignore_errors=True)
+    def temp_download_dir(self, tmp_path):
+        """Provide a temporary download directory for integration tests (pytest-managed)."""
+        return tmp_path
     
     @pytest.fixture
     def user_context(self):
@@ -38,7 +35,7 @@ class TestAudioDownloaderIntegration:
         return SessionManager()
     
     @pytest.mark.integration
-    def test_audio_downloader_with_user_context_integration(self, temp_download_dir, user_context):
+    def test_audio_downloader_with_user_context_integration(self, temp_download_dir, user_context, mock_ytdl):
         """Test AudioDownloader integration with UserContext."""
         # Create downloader with user context
         downloader = AudioDownloader(output_dir=temp_download_dir)
@@ -46,42 +43,36 @@ class TestAudioDownloaderIntegration:
         # Test URL for integration testing (using a real but short video)
         test_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"  # Rick Roll - short video
         
-        # Mock yt-dlp to avoid actual download but test integration
-        with patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL') as mock_ydl_class:
-            # Setup mock yt-dlp
-            mock_ydl_instance = Mock()
-            mock_ydl_instance.extract_info.return_value = {
-                'id': 'dQw4w9WgXcQ',
-                'title': 'Rick Astley - Never Gonna Give You Up',
-                'uploader': 'Rick Astley',
-                'duration': 212,
-                'view_count': 1000000000
-            }
-            mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
-            
-            # Create a mock output file to simulate successful download
-            output_file = temp_download_dir / "Rick Astley - Never Gonna Give You Up.mp3"
-            output_file.write_text("fake audio content")
+        # Custom metadata for the mocked yt-dlp instance
+        mock_ytdl.extract_info.return_value = {
+            'id': 'dQw4w9WgXcQ',
+            'title': 'Rick Astley - Never Gonna Give You Up',
+            'uploader': 'Rick Astley',
+            'duration': 212,
+            'view_count': 1000000000
+        }
+        
+        # Create a mock output file to simulate successful download
+        output_file = temp_download_dir / "Rick Astley - Never Gonna Give You Up.mp3"
+        output_file.write_text("fake audio content")
+        
+        with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
+            # Test download with user context
+            result = downloader.download_audio_with_session(
+                url=test_url,
+                session_uuid=user_context.session_uuid,
+                job_uuid="integration-test-job"
+            )
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
-                # Test download with user context
-                result = downloader.download_audio_with_session(
-                    url=test_url,
-                    session_uuid=user_context.session_uuid,
-                    job_uuid="integration-test-job"
-                )
-                
-                # Verify integration worked
-                assert result.success is True
-                assert result.status == DownloadStatus.COMPLETED
-                assert result.title == "Rick Astley - Never Gonna Give You Up"
-                assert result.artist == "Rick Astley"
-                assert result.duration_seconds == 212
+            # Verify integration worked
+            assert result.success is True
+            assert result.status == DownloadStatus.COMPLETED
+            assert result.title == "Rick Astley - Never Gonna Give You Up"
+            assert result.artist == "Rick Astley"
+            assert result.duration_seconds == 212
     
     @pytest.mark.integration
-    def test_audio_downloader_with_session_manager_integration(self, temp_download_dir, session_manager):
+    def test_audio_downloader_with_session_manager_integration(self, temp_download_dir, session_manager, mock_ytdl):
         """Test AudioDownloader integration with SessionManager."""
         # Create session
         session_uuid = session_manager.create_session()
@@ -93,42 +84,44 @@ class TestAudioDownloaderIntegration:
         # Test URL
         test_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         
-        # Mock yt-dlp
-        with patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL') as mock_ydl_class:
-            mock_ydl_instance = Mock()
-            mock_ydl_instance.extract_info.return_value = {
-                'id': 'dQw4w9WgXcQ',
-                'title': 'Test Video',
-                'uploader': 'Test Channel',
-                'duration': 120
-            }
-            mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+        # Custom metadata for the mocked yt-dlp instance
+        mock_ytdl.extract_info.return_value = {
+            'id': 'dQw4w9WgXcQ',
+            'title': 'Test Video',
+            'uploader': 'Test Channel',
+            'duration': 120
+        }
+        
+        # Create mock output file
+        output_file = temp_download_dir / session_uuid / "test-job" / "audio" / "Test Video.mp3"
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        output_file.write_text("fake audio content")
+        
+        # yt-dlp reports the final file path after post-processing
+        mock_ytdl.process_ie_result.return_value = {
+            'id': 'dQw4w9WgXcQ',
+            'title': 'Test Video',
+            'requested_downloads': [{'filepath': str(output_file)}]
+        }
+        
+        with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
+            # Test download with session manager
+            result = downloader.download_audio_with_session(
+                url=test_url,
+                session_uuid=session_uuid,
+                job_uuid="test-job"
+            )
             
-            # Create mock output file
-            output_file = temp_download_dir / session_uuid / "test-job" / "audio" / "Test Video.mp3"
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            output_file.write_text("fake audio content")
+            # Verify session-specific directory was created
+            session_dir = temp_download_dir / session_uuid / "test-job" / "audio"
+            assert session_dir.exists()
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
-                # Test download with session manager
-                result = downloader.download_audio_with_session(
-                    url=test_url,
-                    session_uuid=session_uuid,
-                    job_uuid="test-job"
-                )
-                
-                # Verify session-specific directory was created
-                session_dir = temp_download_dir / session_uuid / "test-job" / "audio"
-                assert session_dir.exists()
-                
-                # Verify result
-                assert result.success is True
-                assert result.status == DownloadStatus.COMPLETED
+            # Verify result
+            assert result.success is True
+            assert result.status == DownloadStatus.COMPLETED
     
     @pytest.mark.integration
-    def test_audio_downloader_progress_tracking_integration(self, temp_download_dir):
+    def test_audio_downloader_progress_tracking_integration(self, temp_download_dir, mock_ytdl):
         """Test AudioDownloader progress tracking integration."""
         # Track progress calls
         progress_calls = []
@@ -142,51 +135,38 @@ class TestAudioDownloaderIntegration:
             progress_callback=progress_callback
         )
         
-        # Mock yt-dlp with progress simulation
-        with patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL') as mock_ydl_class:
-            mock_ydl_instance = Mock()
-            mock_ydl_instance.extract_info.return_value = {
-                'id': 'test',
-                'title': 'Test Video',
-                'uploader': 'Test Channel',
-                'duration': 120
-            }
-            
-            # Mock download method to simulate progress
-            def mock_download(urls):
-                # Simulate progress updates
-                progress_hook = mock_ydl_instance.add_progress_hook.call_args[0][0]
-                progress_hook({'status': 'downloading', 'downloaded_bytes': 1000, 'total_bytes': 5000})
-                progress_hook({'status': 'downloading', 'downloaded_bytes': 2500, 'total_bytes': 5000})
-                progress_hook({'status': 'downloading', 'downloaded_bytes': 5000, 'total_bytes': 5000})
-                progress_hook({'status': 'finished', 'filename': 'test.mp3'})
-                return []
+        # Mock download method to simulate progress
+        def mock_download(urls):
+            # Simulate progress updates
+            progress_hook = mock_ytdl.add_progress_hook.call_args[0][0]
+            progress_hook({'status': 'downloading', 'downloaded_bytes': 1000, 'total_bytes': 5000})
+            progress_hook({'status': 'downloading', 'downloaded_bytes': 2500, 'total_bytes': 5000})
+            progress_hook({'status': 'downloading', 'downloaded_bytes': 5000, 'total_bytes': 5000})
+            progress_hook({'status': 'finished', 'filename': 'test.mp3'})
+            return []
+        
+        mock_ytdl.download = mock_download
+        
+        # Create mock output file
+        output_file = temp_download_dir / "Test Video.mp3"
+        output_file.write_text("fake audio content")
+        
+        with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
+            # Test download
+            result = downloader.download_audio("https://youtube.com/watch?v=test")
             
-            mock_ydl_instance.download = mock_download
-            mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+            # Verify progress tracking worked
+            assert result.success is True
+            assert len(progress_calls) > 0
             
-            # Create mock output file
-            output_file = temp_download_dir / "Test Video.mp3"
-            output_file.write_text("fake audio content")
+            # Check that progress was tracked
+            downloading_calls = [call for call in progress_calls if call.get('status') == 'downloading']
+            assert len(downloading_calls) > 0
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
-                # Test download
-                result = downloader.download_audio("https://youtube.com/watch?v=test")
-                
-                # Verify progress tracking worked
-                assert result.success is True
-                assert len(progress_calls) > 0
-                
-                # Check that progress was tracked
-                downloading_calls = [call for call in progress_calls if call.get('status') == 'downloading']
-                assert len(downloading_calls) > 0
-                
-                # Verify progress percentages were calculated
-                for call in downloading_calls:
-                    if 'progress_percent' in call and call['progress_percent'] is not None:
-                        assert 0 <= call['progress_percent'] <= 100
+            # Verify progress percentages were calculated
+            for call in downloading_calls:
+                if 'progress_percent' in call and call['progress_percent'] is not None:
+                    assert 0 <= call['progress_percent'] <= 100
     
     @pytest.mark.integration
     def test_audio_downloader_multiple_formats_integration(self, temp_download_dir):
@@ -207,7 +187,7 @@ class TestAudioDownloaderIntegration:
             assert opts['format'] == f'bestaudio[ext={format_type}]'
     
     @pytest.mark.integration
-    def test_audio_downloader_error_handling_integration(self, temp_download_dir):
+    def test_audio_downloader_error_handling_integration(self, temp_download_dir, mock_ytdl, mocker):
         """Test AudioDownloader error handling integration."""
         downloader = AudioDownloader(output_dir=temp_download_dir)
         
@@ -221,28 +201,22 @@ class TestAudioDownloaderIntegration:
         non_existent_dir = temp_download_dir / "non_existent"
         downloader_bad_dir = AudioDownloader(output_dir=non_existent_dir)
         
-        with patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL') as mock_ydl_class:
-            mock_ydl_instance = Mock()
-            mock_ydl_instance.extract_info.return_value = {
-                'id': 'test',
-                'title': 'Test Video',
-                'uploader': 'Test Channel',
-                'duration': 120
-            }
-            mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
-            
-            # Mock download to not create any files
-            mock_ydl_instance.download.return_value = []
-            
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = []  # No files found
-                
-                result = downloader_bad_dir.download_audio("https://youtube.com/watch?v=test")
-                assert result.success is False
-                assert "no output file found" in result.error_message
+        # Mock download to not create any files
+        mock_ytdl.download.return_value = []
+        
+        mocker.patch.object(AudioDownloader, '_resolve_output_file', return_value=None)  # No files found
+        
+        result = downloader_bad_dir.download_audio("https://youtube.com/watch?v=test")
+        assert result.success is False
+        assert "no output file found" in result.error_message
     
     @pytest.mark.integration
     @pytest.mark.slow
+    @pytest.mark.requires_network
+    @pytest.mark.skipif(
+        not os.environ.get("RUN_NETWORK_TESTS"),
+        reason="network test; set RUN_NETWORK_TESTS=1"
+    )
     def test_audio_downloader_real_download_integration(self, temp_download_dir):
         """Test AudioDownloader with real YouTube download (slow test)."""
         # This test actually downloads a short video - use sparingly
@@ -284,7 +258,7 @@ class TestAudioDownloaderIntegration:
             result.output_path.unlink()
     
     @pytest.mark.integration
-    def test_audio_downloader_concurrent_sessions_integration(self, temp_download_dir):
+    def test_audio_downloader_concurrent_sessions_integration(self, temp_download_dir, mock_ytdl):
         """Test AudioDownloader with multiple concurrent sessions."""
         # Create multiple user contexts
         contexts = [
@@ -294,49 +268,33 @@ class TestAudioDownloaderIntegration:
         
         downloader = AudioDownloader(output_dir=temp_download_dir)
         
-        # Mock yt-dlp for all sessions
-        with patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL') as mock_ydl_class:
-            mock_ydl_instance = Mock()
-            mock_ydl_instance.extract_info.return_value = {
-                'id': 'test',
-                'title': 'Test Video',
-                'uploader': 'Test Channel',
-                'duration': 120
-            }
-            mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
-            
-            results = []
-            
-            # Simulate concurrent downloads
+        results = []
+        output_files = []
+        
+        # Simulate concurrent downloads
+        for i, context in enumerate(contexts):
+            # Create session-specific output file
+            output_file = temp_download_dir / context.session_uuid / f"job-{i}" / "audio" / f"Test Video {i}.mp3"
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            output_file.write_text(f"fake audio content {i}")
+            output_files.append(output_file)
+        
+        # Each download resolves to its own session's file, in order
+        with patch.object(AudioDownloader, '_resolve_output_file', side_effect=output_files):
+            # Test concurrent downloads
             for i, context in enumerate(contexts):
-                # Create session-specific output file
-                output_file = temp_download_dir / context.session_uuid / f"job-{i}" / "audio" / f"Test Video {i}.mp3"
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                output_file.write_text(f"fake audio content {i}")
+                result = downloader.download_audio_with_session(
+                    url="https://youtube.com/watch?v=test",
+                    session_uuid=context.session_uuid,
+                    job_uuid=f"job-{i}"
+                )
+                results.append(result)
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                # Mock glob to return appropriate files for each session
-                def mock_glob_func(pattern):
-                    # Find the session directory from the calling context
-                    # This is a simplified mock - in real scenario, each session would have its own directory
-                    return [temp_download_dir / f"session-{i}" / f"job-{i}" / "audio" / f"Test Video {i}.mp3" for i in range(3)]
-                
-                mock_glob.side_effect = mock_glob_func
-                
-                # Test concurrent downloads
-                for i, context in enumerate(contexts):
-                    result = downloader.download_audio_with_session(
-                        url="https://youtube.com/watch?v=test",
-                        session_uuid=context.session_uuid,
-                        job_uuid=f"job-{i}"
-                    )
-                    results.append(result)
+            # Verify all downloads succeeded
+            for i, result in enumerate(results):
+                assert result.success is True
+                assert result.status == DownloadStatus.COMPLETED
                 
-                # Verify all downloads succeeded
-                for i, result in enumerate(results):
-                    assert result.success is True
-                    assert result.status == DownloadStatus.COMPLETED
-                    
-                    # Verify session-specific directory exists
-                    session_dir = temp_download_dir / f"session-{i}" / f"job-{i}" / "audio"
-                    assert session_dir.exists()
+                # Verify session-specific directory exists
+                session_dir = temp_download_dir / f"session-{i}" / f"job-{i}" / "audio"
+                assert session_dir.exists()
@@ -6,18 +6,13 @@ with all components working together.
 """
 
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
 from unittest.mock import patch, Mock
 import json
 import time
 
-from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
-from src.api.main import app
-from src.common.session_manager import SessionManager
 from src.common.user_context import UserContext
 from src.yt_audio_dl.audio_core import AudioDownloader, DownloadStatus
 
@@ -26,21 +21,9 @@ class TestEndToEndIntegration:
     """End-to-end integration tests for the complete system."""
     
     @pytest.fixture
-    def temp_download_dir(self):
-        """Create a temporary download directory for E2E tests."""
-        temp_path = Path(tempfile.mkdtemp())
-        yield temp_path
-        shutil.rmtree(temp_path, ignore_errors=True)
-    
-    @pytest.fixture
-    def client(self):
-        """Create a test client for E2E tests."""
-        return TestClient(app)
-    
-    @pytest.fixture
-    def session_manager(self):
-        """Create a real SessionManager for E2E tests."""
-        return SessionManager()
+    def temp_download_dir(self, tmp_path_factory):
+        """Create a temporary download directory for E2E tests (pytest-managed)."""
+        return tmp_path_factory.mktemp("e2e")
     
     @pytest.mark.integration
     @pytest.mark.slow
@@ -82,9 +65,7 @@ class TestEndToEndIntegration:
             output_file.parent.mkdir(parents=True, exist_ok=True)
             output_file.write_text("fake audio content")
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
                 # Step 4: Start job processing via API
                 start_response = client.post(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}/start")
                 assert start_response.status_code == 200
@@ -160,18 +141,15 @@ class TestEndToEndIntegration:
             mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
             
             # Create mock output files for each job
+            output_files = []
             for i, (session_uuid, job_uuid) in enumerate(jobs):
                 output_file = temp_download_dir / session_uuid / job_uuid / "audio" / f"Test Video {i}.mp3"
                 output_file.parent.mkdir(parents=True, exist_ok=True)
                 output_file.write_text(f"fake audio content {i}")
+                output_files.append(output_file)
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                def mock_glob_func(pattern):
-                    # Return appropriate files based on the calling context
-                    return [temp_download_dir / f"session-{i}" / f"job-{i}" / "audio" / f"Test Video {i}.mp3" for i in range(3)]
-                
-                mock_glob.side_effect = mock_glob_func
-                
+            # Jobs are started in order, so each resolves to its own file
+            with patch.object(AudioDownloader, '_resolve_output_file', side_effect=output_files):
                 # Start all jobs
                 for session_uuid, job_uuid in jobs:
                     start_response = client.post(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}/start")
@@ -323,9 +301,7 @@ class TestEndToEndIntegration:
             output_file.parent.mkdir(parents=True, exist_ok=True)
             output_file.write_text("fake audio content")
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
                 # Start job
                 start_response = client.post(f"/api/sessions/{session_uuid}/api/jobs/{job_uuid}/start")
                 assert start_response.status_code == 200
@@ -114,9 +114,7 @@ class TestSessionManagementIntegration:
             output_file.parent.mkdir(parents=True, exist_ok=True)
             output_file.write_text("fake audio content")
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
                 # Start job
                 job_started = session_manager.start_job(
                     session_uuid=session_uuid,
@@ -270,9 +268,7 @@ class TestSessionManagementIntegration:
             output_file.parent.mkdir(parents=True, exist_ok=True)
             output_file.write_text("fake audio content")
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
                 # Test session-based download
                 result = downloader.download_audio_with_session(
                     url="https://youtube.com/watch?v=test",
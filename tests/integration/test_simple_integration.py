@@ -156,9 +156,7 @@ class TestSimpleIntegration:
             output_file = temp_download_dir / "Test Video.mp3"
             output_file.write_text("fake audio content")
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
                 # Test download
                 result = downloader.download_audio("https://youtube.com/watch?v=test")
                 
@@ -194,9 +192,7 @@ class TestSimpleIntegration:
             output_file.parent.mkdir(parents=True, exist_ok=True)
             output_file.write_text("fake audio content")
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
                 # Test session-based download
                 result = downloader.download_audio_with_session(
                     url="https://youtube.com/watch?v=test",
@@ -254,9 +250,7 @@ class TestSimpleIntegration:
             output_file = temp_download_dir / "Test Video.mp3"
             output_file.write_text("fake audio content")
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = [output_file]
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
                 # Test download
                 result = downloader.download_audio("https://youtube.com/watch?v=test")
                 
@@ -321,9 +315,7 @@ class TestSimpleIntegration:
             # Mock download to not create any files
             mock_ydl_instance.download.return_value = []
             
-            with patch('pathlib.Path.glob') as mock_glob:
-                mock_glob.return_value = []  # No files found
-                
+            with patch.object(AudioDownloader, '_resolve_output_file', return_value=None):  # No files found
                 result = downloader_bad_dir.download_audio("https://youtube.com/watch?v=test")
                 assert result.success is False
                 assert "no output file found" in result.error_message
@@ -5,7 +5,11 @@ This module tests the AudioDownloader class with various scenarios including
 download validation, progress tracking, and error handling.
 """
 
+import dataclasses
+import os
+import threading
 import pytest
+import yt_dlp
 from unittest.mock import Mock, patch, MagicMock, mock_open
 from pathlib import Path
 from src.yt_audio_dl.audio_core import (
@@ -15,6 +19,7 @@ from src.yt_audio_dl.audio_core import (
     DownloadStatus,
     ProgressHook
 )
+from src.common.metadata_cache import MetadataCache
 
 
 class TestAudioDownloader:
@@ -69,6 +74,38 @@ class TestAudioDownloader:
         assert opts['format'] == 'best'
         assert opts['audioformat'] == 'mp3'
     
+    @pytest.mark.unit
+    def test_get_ydl_opts_concurrent_fragments(self, temp_download_dir):
+        """Test yt-dlp options enable parallel fragment downloads."""
+        downloader = AudioDownloader(output_dir=temp_download_dir, concurrent_fragments=8)
+        
+        opts = downloader._get_ydl_opts("%(title)s.%(ext)s")
+        
+        assert opts['concurrent_fragment_downloads'] == 8
+        assert opts['http_chunk_size'] == 10 * 1024 * 1024
+    
+    @pytest.mark.unit
+    def test_get_ydl_opts_external_downloader(self, temp_download_dir):
+        """Test yt-dlp options use an installed external downloader."""
+        with patch('src.yt_audio_dl.audio_core.shutil.which', return_value='/usr/bin/aria2c'):
+            downloader = AudioDownloader(output_dir=temp_download_dir, external_downloader='aria2c')
+        
+        opts = downloader._get_ydl_opts("%(title)s.%(ext)s")
+        
+        assert opts['external_downloader'] == 'aria2c'
+        assert '-x' in opts['external_downloader_args']['aria2c']
+    
+    @pytest.mark.unit
+    def test_external_downloader_missing_falls_back(self, temp_download_dir):
+        """Test missing external downloader falls back to the built-in one."""
+        with patch('src.yt_audio_dl.audio_core.shutil.which', return_value=None):
+            downloader = AudioDownloader(output_dir=temp_download_dir, external_downloader='aria2c')
+        
+        opts = downloader._get_ydl_opts("%(title)s.%(ext)s")
+        
+        assert downloader.external_downloader is None
+        assert 'external_downloader' not in opts
+    
     @pytest.mark.unit
     @patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL')
     def test_get_video_info_success(self, mock_ydl_class, temp_download_dir):
@@ -110,6 +147,99 @@ class TestAudioDownloader:
         with pytest.raises(AudioDownloadError, match="Unable to extract video information"):
             downloader.get_video_info("https://youtube.com/watch?v=test")
     
+    @pytest.mark.unit
+    @patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL')
+    def test_get_video_info_uses_metadata_cache(self, mock_ydl_class, temp_download_dir, temp_dir):
+        """Test that repeated video info lookups are served from the metadata cache."""
+        cache = MetadataCache(cache_dir=temp_dir / "cache")
+        downloader = AudioDownloader(output_dir=temp_download_dir, metadata_cache=cache)
+        
+        mock_ydl_instance = Mock()
+        mock_ydl_instance.extract_info.return_value = {
+            'id': 'dQw4w9WgXcQ',
+            'title': 'Test Video',
+            'formats': [{'format_id': '140'}]
+        }
+        mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+        
+        first = downloader.get_video_info("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        second = downloader.get_video_info("https://youtu.be/dQw4w9WgXcQ?t=42")
+        
+        assert first == second
+        assert first['title'] == 'Test Video'
+        assert 'formats' not in first
+        mock_ydl_instance.extract_info.assert_called_once()
+        
+        downloader.invalidate_metadata("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        downloader.get_video_info("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        assert mock_ydl_instance.extract_info.call_count == 2
+    
+    @pytest.mark.unit
+    @patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL')
+    def test_get_video_info_reuses_ydl_instance(self, mock_ydl_class, temp_download_dir):
+        """Test info extraction reuses one pooled yt-dlp instance until closed."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        
+        mock_ydl_instance = MagicMock()
+        mock_ydl_instance.extract_info.return_value = {'id': 'test-video-id', 'title': 'Test Video'}
+        mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+        
+        downloader.get_video_info("https://youtube.com/watch?v=test")
+        downloader.get_video_info("https://youtube.com/watch?v=test")
+        
+        mock_ydl_class.assert_called_once()
+        assert mock_ydl_instance.extract_info.call_count == 2
+        
+        downloader.close()
+        mock_ydl_instance.__exit__.assert_called_once()
+    
+    @pytest.mark.unit
+    @patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL')
+    def test_pooled_ydl_released_when_thread_exits(self, mock_ydl_class, temp_download_dir):
+        """Test instances owned by finished worker threads are closed."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        
+        worker_ydl, main_ydl = MagicMock(), MagicMock()
+        for ydl in (worker_ydl, main_ydl):
+            ydl.extract_info.return_value = {'id': 'test-video-id', 'title': 'Test Video'}
+        mock_ydl_class.return_value.__enter__.side_effect = [worker_ydl, main_ydl]
+        
+        worker = threading.Thread(target=downloader.get_video_info, args=("https://youtube.com/watch?v=test",))
+        worker.start()
+        worker.join()
+        worker_ydl.__exit__.assert_not_called()
+        
+        # Creating the next instance releases the exited worker's one
+        downloader.get_video_info("https://youtube.com/watch?v=other")
+        worker_ydl.__exit__.assert_called_once()
+        assert list(downloader._pooled_ydls.values()) == [main_ydl]
+        
+        downloader.close()
+        main_ydl.__exit__.assert_called_once()
+    
+    @pytest.mark.unit
+    def test_download_info_reused_until_invalidated(self, temp_download_dir):
+        """Test full yt-dlp info is reused for repeated downloads of a video."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        
+        with patch.object(downloader, '_extract_info',
+                          return_value={'id': 'dQw4w9WgXcQ', 'formats': [{'format_id': '140'}]}) as mock_extract:
+            first = downloader._get_download_info('dQw4w9WgXcQ', url)
+            first['requested_downloads'] = [{'filepath': 'mutated.mp3'}]
+            second = downloader._get_download_info('dQw4w9WgXcQ', url)
+            
+            mock_extract.assert_called_once()
+            assert 'requested_downloads' not in second
+            
+            # The cached entry was handed out, so the next download extracts again
+            downloader._get_download_info('dQw4w9WgXcQ', url)
+            assert mock_extract.call_count == 2
+            
+            downloader.invalidate_metadata(url)
+            downloader._get_download_info('dQw4w9WgXcQ', url)
+            assert mock_extract.call_count == 3
+    
     @pytest.mark.unit
     def test_validate_url_valid_youtube(self, temp_download_dir):
         """Test URL validation with valid YouTube URL."""
@@ -121,6 +251,22 @@ class TestAudioDownloader:
             result = downloader.validate_url("https://www.youtube.com/watch?v=test")
             assert result is True
     
+    @pytest.mark.unit
+    def test_validate_url_caches_results(self, temp_download_dir):
+        """Test URL validation results are cached for repeated URLs."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        
+        with patch.object(downloader, 'get_video_info') as mock_get_info:
+            mock_get_info.return_value = {'title': 'Test'}
+            assert downloader.validate_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ") is True
+            assert downloader.validate_url("https://youtu.be/dQw4w9WgXcQ?t=42") is True
+            mock_get_info.assert_called_once()
+            
+            mock_get_info.side_effect = AudioDownloadError("Video unavailable")
+            assert downloader.validate_url("https://www.youtube.com/watch?v=aaaaaaaaaaa") is False
+            assert downloader.validate_url("https://www.youtube.com/watch?v=aaaaaaaaaaa") is False
+            assert mock_get_info.call_count == 2
+    
     @pytest.mark.unit
     def test_validate_url_invalid_domain(self, temp_download_dir):
         """Test URL validation with invalid domain."""
@@ -166,10 +312,8 @@ class TestAudioDownloader:
         output_file = temp_download_dir / "Test Video.mp3"
         output_file.write_text("fake audio content")
         
-        # Mock glob to return our test file
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_glob.return_value = [output_file]
-            
+        # Resolve the download to our test file
+        with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
             result = downloader.download_audio("https://youtube.com/watch?v=test")
             
             assert result.success is True
@@ -193,9 +337,7 @@ class TestAudioDownloader:
         output_file = temp_download_dir / "custom_name.mp3"
         output_file.write_text("fake audio content")
         
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_glob.return_value = [output_file]
-            
+        with patch.object(AudioDownloader, '_resolve_output_file', return_value=output_file):
             result = downloader.download_audio(
                 "https://youtube.com/watch?v=test",
                 output_filename="custom_name.%(ext)s"
@@ -214,16 +356,98 @@ class TestAudioDownloader:
         mock_ydl_instance.extract_info.return_value = {'title': 'Test'}
         mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
         
-        # Mock empty glob result (no output files)
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_glob.return_value = []
-            
+        # No output file found after the download
+        with patch.object(AudioDownloader, '_resolve_output_file', return_value=None):
             result = downloader.download_audio("https://youtube.com/watch?v=test")
             
             assert result.success is False
             assert result.status == DownloadStatus.FAILED
             assert "no output file found" in result.error_message
     
+    @pytest.mark.unit
+    def test_download_audio_retries_network_errors_with_monitor_delay(self, temp_download_dir):
+        """Test network errors are retried in place after the monitor's delay."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        downloader.monitor = Mock()
+        downloader.monitor.start_download_monitoring.return_value = True
+        downloader.monitor.handle_network_error.return_value = True
+        downloader.monitor.get_retry_delay.return_value = 1.5
+        
+        info = {'id': 'dQw4w9WgXcQ', 'title': 'Test Video', 'uploader': 'Test Channel', 'duration': 120}
+        output_file = temp_download_dir / "Test Video.mp3"
+        output_file.write_text("fake audio content")
+        
+        with patch.object(downloader, '_extract_info', return_value=info), \
+             patch.object(downloader, '_run_download', side_effect=[
+                 yt_dlp.DownloadError("Connection reset by peer"),
+                 (info, str(output_file)),
+             ]) as mock_run, \
+             patch('src.yt_audio_dl.audio_core.time.sleep') as mock_sleep:
+            result = downloader.download_audio("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        
+        assert result.success is True
+        assert result.output_path == output_file
+        assert mock_run.call_count == 2
+        mock_sleep.assert_called_once_with(1.5)
+        
+        download_id = downloader.monitor.start_download_monitoring.call_args[0][0]
+        assert download_id.startswith("download_dQw4w9WgXcQ_")
+    
+    @pytest.mark.unit
+    @patch('src.yt_audio_dl.audio_core.yt_dlp.YoutubeDL')
+    def test_download_audio_with_session_forwards_progress_callback(self, mock_ydl_class, temp_download_dir):
+        """Test the session download reports yt-dlp progress to the caller's callback."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        downloader.monitor = Mock()
+        downloader.monitor.start_download_monitoring.return_value = True
+        
+        info = {'id': 'dQw4w9WgXcQ', 'title': 'Test Video', 'uploader': 'Test Channel', 'duration': 120}
+        output_file = temp_download_dir / "session-1" / "job-1" / "Test Video.mp3"
+        output_file.parent.mkdir(parents=True)
+        output_file.write_text("fake audio content")
+        
+        # Fake yt-dlp instance that reports a finished download to its hooks
+        hooks = []
+        mock_ydl = MagicMock()
+        mock_ydl.add_progress_hook.side_effect = hooks.append
+        
+        def process_ie_result(result, download):
+            for hook in hooks:
+                hook({'status': 'finished', 'filename': str(output_file)})
+            return result
+        
+        mock_ydl.process_ie_result.side_effect = process_ie_result
+        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
+        
+        progress_callback = Mock()
+        with patch.object(downloader, '_extract_info', return_value=info):
+            result = downloader.download_audio_with_session(
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                session_uuid="session-1",
+                job_uuid="job-1",
+                progress_callback=progress_callback
+            )
+        
+        assert result.success is True
+        assert result.output_path == output_file
+        progress_callback.assert_called_once_with({'status': 'finished', 'filename': str(output_file)})
+    
+    @pytest.mark.unit
+    def test_resolve_output_file_falls_back_to_newest_mp3(self, temp_download_dir):
+        """Test output discovery picks the newest MP3 when the reported path is missing."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        
+        older = temp_download_dir / "older.mp3"
+        newer = temp_download_dir / "newer.mp3"
+        other = temp_download_dir / "newest.webm"
+        for mtime, file_path in enumerate([older, newer, other], start=1):
+            file_path.write_text("fake audio content")
+            os.utime(file_path, (mtime, mtime))
+        
+        assert downloader._resolve_output_file(str(temp_download_dir / "missing.mp3")) == newer
+        assert downloader._resolve_output_file(str(older)) == older
+        assert downloader._resolve_output_file(None, temp_download_dir / "missing_dir") is None
+    
     @pytest.mark.unit
     def test_download_audio_with_session(self, temp_download_dir):
         """Test session-based audio download."""
@@ -243,7 +467,12 @@ class TestAudioDownloader:
             )
             
             assert result.success is True
-            mock_download.assert_called_once()
+            mock_download.assert_called_once_with(
+                "https://youtube.com/watch?v=test",
+                output_dir_override=temp_download_dir / "test-session" / "test-job",
+                progress_callback=None
+            )
+            assert (temp_download_dir / "test-session" / "test-job").is_dir()
     
     @pytest.mark.unit
     def test_download_audio_with_session_error(self, temp_download_dir):
@@ -262,6 +491,51 @@ class TestAudioDownloader:
             assert result.success is False
             assert result.status == DownloadStatus.FAILED
             assert "Session download error" in result.error_message
+    
+    @pytest.mark.unit
+    def test_download_audio_batch_preserves_order(self, temp_download_dir):
+        """Test batch download returns one result per URL in input order."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        urls = [f"https://youtube.com/watch?v=test{i}" for i in range(5)]
+        
+        def fake_download(url):
+            if url.endswith("test2"):
+                raise Exception("Download error")
+            return AudioDownloadResult(success=True, status=DownloadStatus.COMPLETED, title=url)
+        
+        with patch.object(downloader, 'download_audio', side_effect=fake_download) as mock_download:
+            results = downloader.download_audio_batch(urls, max_workers=3)
+        
+        assert mock_download.call_count == len(urls)
+        assert len(results) == len(urls)
+        assert [r.title for r in results if r.success] == [u for u in urls if not u.endswith("test2")]
+        assert results[2].success is False
+        assert "Batch download error" in results[2].error_message
+    
+    @pytest.mark.unit
+    def test_download_audio_pipelined_converts_downloads(self, temp_download_dir):
+        """Test pipelined download converts each unconverted download to MP3."""
+        downloader = AudioDownloader(output_dir=temp_download_dir)
+        urls = [f"https://youtube.com/watch?v=test{i}" for i in range(3)]
+        
+        def fake_download(url, extract_audio=True):
+            assert extract_audio is False
+            source = temp_download_dir / f"{url[-5:]}.webm"
+            source.write_text("fake stream")
+            return AudioDownloadResult(success=True, status=DownloadStatus.COMPLETED,
+                                       output_path=source, format='webm', download_time_seconds=1.0)
+        
+        def fake_ffmpeg(command, **kwargs):
+            Path(command[-1]).write_text("fake audio content")
+        
+        with patch.object(downloader, 'download_audio', side_effect=fake_download), \
+             patch('src.yt_audio_dl.audio_core.subprocess.run', side_effect=fake_ffmpeg) as mock_run:
+            results = downloader.download_audio_pipelined(urls)
+        
+        assert mock_run.call_count == len(urls)
+        assert [r.output_path.name for r in results] == ["test0.mp3", "test1.mp3", "test2.mp3"]
+        assert all(r.success and r.format == 'mp3' for r in results)
+        assert not list(temp_download_dir.glob("*.webm"))
 
 
 class TestProgressHook:
@@ -370,6 +644,20 @@ class TestProgressHook:
         # Check callback
         call_args = mock_progress_callback.call_args[0][0]
         assert call_args['progress_percent'] is None
+    
+    @pytest.mark.unit
+    def test_progress_hook_throttles_callback(self, mock_progress_callback):
+        """Test ProgressHook throttles downloading callbacks but not finished."""
+        hook = ProgressHook(mock_progress_callback)
+        
+        for downloaded in range(1000, 6000, 1000):
+            hook({'status': 'downloading', 'total_bytes': 10000, 'downloaded_bytes': downloaded})
+        hook({'status': 'finished', 'filename': 'output.mp3'})
+        
+        # All state is updated, but only the first progress event and finished are reported
+        assert hook.downloaded_bytes == 5000
+        assert mock_progress_callback.call_count == 2
+        assert mock_progress_callback.call_args[0][0]['status'] == 'finished'
 
 
 class TestAudioDownloadResult:
@@ -425,6 +713,21 @@ class TestAudioDownloadResult:
         assert result.title is None
         assert result.artist is None
         assert result.error_message is None
+    
+    @pytest.mark.unit
+    def test_audio_download_result_is_immutable(self):
+        """Test AudioDownloadResult cannot be modified after creation."""
+        result = AudioDownloadResult(
+            success=True,
+            status=DownloadStatus.COMPLETED
+        )
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.success = False
+        
+        updated = dataclasses.replace(result, success=False, status=DownloadStatus.FAILED)
+        assert result.success is True
+        assert updated.status == DownloadStatus.FAILED
 
 
 class TestAudioDownloadError:
@@ -0,0 +1,87 @@
+"""
+Unit tests for the video metadata cache.
+
+This module tests the disk-backed TTL cache used to avoid repeated
+yt-dlp metadata extractions.
+"""
+
+import pytest
+from unittest.mock import patch
+from src.common.metadata_cache import MetadataCache
+
+
+class TestMetadataCache:
+    """Test MetadataCache functionality."""
+    
+    @pytest.mark.unit
+    def test_get_missing_entry_returns_none(self, temp_dir):
+        """Test that a missing entry returns None."""
+        cache = MetadataCache(cache_dir=temp_dir)
+        
+        assert cache.get("dQw4w9WgXcQ") is None
+    
+    @pytest.mark.unit
+    def test_set_and_get(self, temp_dir):
+        """Test storing and retrieving an entry."""
+        cache = MetadataCache(cache_dir=temp_dir)
+        
+        cache.set("dQw4w9WgXcQ", {'title': 'Test Video', 'duration': 120})
+        
+        assert cache.get("dQw4w9WgXcQ") == {'title': 'Test Video', 'duration': 120}
+    
+    @pytest.mark.unit
+    def test_entries_persist_across_instances(self, temp_dir):
+        """Test that entries are read back from disk by a new cache instance."""
+        MetadataCache(cache_dir=temp_dir).set("dQw4w9WgXcQ", {'title': 'Test Video'})
+        
+        cache = MetadataCache(cache_dir=temp_dir)
+        
+        assert cache.get("dQw4w9WgXcQ") == {'title': 'Test Video'}
+    
+    @pytest.mark.unit
+    def test_expired_entry_returns_none(self, temp_dir):
+        """Test that expired entries are not returned."""
+        cache = MetadataCache(cache_dir=temp_dir, ttl_seconds=60)
+        
+        with patch('src.common.metadata_cache.time.time', return_value=1000.0):
+            cache.set("dQw4w9WgXcQ", {'title': 'Test Video'})
+        
+        with patch('src.common.metadata_cache.time.time', return_value=1061.0):
+            assert cache.get("dQw4w9WgXcQ") is None
+        
+        assert not (temp_dir / "dQw4w9WgXcQ.json").exists()
+    
+    @pytest.mark.unit
+    def test_invalidate_and_clear(self, temp_dir):
+        """Test invalidating a single entry and clearing the cache."""
+        cache = MetadataCache(cache_dir=temp_dir)
+        cache.set("dQw4w9WgXcQ", {'title': 'First'})
+        cache.set("9bZkp7q19f0", {'title': 'Second'})
+        
+        cache.invalidate("dQw4w9WgXcQ")
+        assert cache.get("dQw4w9WgXcQ") is None
+        assert cache.get("9bZkp7q19f0") == {'title': 'Second'}
+        
+        cache.clear()
+        assert cache.get("9bZkp7q19f0") is None
+        assert list(temp_dir.glob("*.json")) == []
+    
+    @pytest.mark.unit
+    def test_unreadable_entry_is_ignored(self, temp_dir):
+        """Test that a corrupt cache file is treated as a miss."""
+        (temp_dir / "dQw4w9WgXcQ.json").write_text("not json")
+        cache = MetadataCache(cache_dir=temp_dir)
+        
+        assert cache.get("dQw4w9WgXcQ") is None
+    
+    @pytest.mark.unit
+    def test_memory_entries_are_bounded(self, temp_dir):
+        """Test that least recently used entries leave memory but stay on disk."""
+        cache = MetadataCache(cache_dir=temp_dir, max_memory_entries=2)
+        cache.set("dQw4w9WgXcQ", {'title': 'First'})
+        cache.set("9bZkp7q19f0", {'title': 'Second'})
+        cache.get("dQw4w9WgXcQ")
+        cache.set("kJQP7kiw5Fk", {'title': 'Third'})
+        
+        assert list(cache._entries) == ["dQw4w9WgXcQ", "kJQP7kiw5Fk"]
+        assert cache.get("9bZkp7q19f0") == {'title': 'Second'}
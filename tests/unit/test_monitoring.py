@@ -8,10 +8,12 @@ import sys
 import logging
 from pathlib import Path
 
-# Add src to path (correct path from tests/unit/ to project root)
-TEST_DIR = Path(__file__).resolve().parent
-PROJECT_ROOT = TEST_DIR.parent.parent
-sys.path.insert(0, str(PROJECT_ROOT / "src"))
+# Run as a script, only the script's own directory is on sys.path; add the
+# project root so the tests package (and through it src) can be imported
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tests._bootstrap  # noqa: F401
 
 from src.common.download_monitor import setup_download_monitoring, DownloadEvent
 from src.yt_audio_dl.audio_core import AudioDownloader
@@ -77,6 +79,85 @@ def test_download_monitoring_integration():
     monitor.log_download_summary()
 
 
+@pytest.mark.unit
+def test_network_check_result_is_cached():
+    """Repeated connectivity checks reuse a recent result."""
+    from unittest.mock import MagicMock, patch
+    from src.common.download_monitor import DownloadMonitor
+    
+    monitor = DownloadMonitor(enable_network_checks=True)
+    response = MagicMock()
+    response.__enter__.return_value.status = 200
+    
+    with patch('socket.gethostbyname', return_value='127.0.0.1') as mock_dns, \
+         patch('urllib.request.urlopen', return_value=response):
+        first = monitor.check_network_connectivity()
+        second = monitor.check_network_connectivity()
+        assert first.is_online
+        assert second is first
+        assert mock_dns.call_count == 1
+        
+        # max_age=0 forces a fresh probe
+        monitor.check_network_connectivity(max_age=0)
+        assert mock_dns.call_count == 2
+
+
+@pytest.mark.unit
+def test_network_probes_run_concurrently():
+    """The DNS and HTTPS probes are in flight at the same time."""
+    import threading
+    from unittest.mock import MagicMock, patch
+    from src.common.download_monitor import DownloadMonitor
+    
+    monitor = DownloadMonitor(enable_network_checks=True)
+    response = MagicMock()
+    response.__enter__.return_value.status = 200
+    
+    # Each probe waits for the other; run one after the other, they time out
+    both_started = threading.Barrier(2, timeout=2)
+    
+    def resolve(host):
+        both_started.wait()
+        return '127.0.0.1'
+    
+    def urlopen(url, timeout):
+        both_started.wait()
+        return response
+    
+    with patch('socket.gethostbyname', side_effect=resolve), \
+         patch('urllib.request.urlopen', side_effect=urlopen):
+        result = monitor.check_network_connectivity(max_age=0)
+    
+    assert result.is_online
+
+
+@pytest.mark.unit
+def test_retry_delay_follows_error_type():
+    """handle_network_error records the backoff delay it logs for the next retry."""
+    from unittest.mock import patch
+    from src.common.download_monitor import DownloadMonitor, RETRY_MAX_DELAY
+    
+    monitor = DownloadMonitor(enable_network_checks=False, retry_attempts=5, retry_delay=4.0)
+    monitor.start_download_monitoring("dl", "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    
+    with patch('random.uniform', return_value=1.0) as mock_jitter:
+        assert monitor.handle_network_error("dl", Exception("Failed to resolve host"))
+        assert monitor.get_retry_delay("dl") == 8.0
+        mock_jitter.assert_called_with(0.5, 1.0)
+        
+        # Second attempt doubles the error type's base delay
+        assert monitor.handle_network_error("dl", Exception("Connection broken: IncompleteRead"))
+        assert monitor.get_retry_delay("dl") == 4.0
+        
+        # Backoff is capped
+        assert monitor.handle_network_error("dl", Exception("Failed to resolve host"))
+        assert monitor.get_retry_delay("dl") == RETRY_MAX_DELAY
+    
+    with patch('random.uniform', return_value=0.5):
+        assert monitor.handle_network_error("dl", Exception("Connection broken: IncompleteRead"))
+        assert monitor.get_retry_delay("dl") == 8.0
+
+
 def main():
     """Test the monitoring system."""
     # Set up logging
@@ -123,4 +204,4 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())